@@ -3,7 +3,9 @@
 from .acceptor import start_acceptor, AcceptorConfig
 from .initiator import start_initiator, InitiatorConfig
 from .persistence import FileStore, SqlStore
+from .raw_fix_message import RawFixMessage
 from .types import Session, Store, FIXApplication, FIXEngine
+from .utils.event_loop import install_uvloop
 
 __all__ = [
     'start_acceptor',
@@ -15,8 +17,12 @@ __all__ = [
     'FileStore',
     'SqlStore',
 
+    'RawFixMessage',
+
     'Session',
     'Store',
     'FIXApplication',
-    'FIXEngine'
+    'FIXEngine',
+
+    'install_uvloop'
 ]
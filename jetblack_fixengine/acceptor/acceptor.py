@@ -15,6 +15,8 @@ from jetblack_fixparser.fix_message import FixMessageFactory
 from jetblack_fixparser.meta_data import ProtocolMetaData
 
 from ..admin import AdminState, AdminEvent, AdminMessage
+from ..fix_message_template import FixMessageTemplate
+from ..raw_fix_message import RawFixMessage
 from ..time_provider import TimeProvider, DefaultTimeProvider
 from ..transports import (
     TransportEvent,
@@ -22,19 +24,61 @@ from ..transports import (
     TransportState,
     TransportStateMachine,
     Send,
-    Receive
+    Receive,
+    ReceiveNowait
 )
 from ..types import FIXApplication, Session, Store
+from ..utils.timeouts import wait_with_timeout
 
 from .state_machine import AcceptorAdminStateMachine
 from .types import AbstractAcceptorEngine
 
 LOGGER = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
+# Handlers only read the timeout message, so one instance is reused.
+_TIMEOUT_RECEIVED = TransportMessage(TransportEvent.TIMEOUT_RECEIVED)
+
+# The most messages to handle from the receive queue between logout and
+# heartbeat checks.
+_MAX_BATCH_SIZE = 32
+
+
+async def _send_not_connected(
+        _transport_message: Union[TransportMessage, bytes]
+) -> None:
+    raise ValueError("Not connected")
+
 
 class AcceptorEngine(AbstractAcceptorEngine):
     """The base class for acceptor handlers"""
 
+    __slots__ = (
+        'protocol',
+        'sender_comp_id',
+        'target_comp_id',
+        '_heartbeat_timeout',
+        '_heartbeat_threshold',
+        'cancellation_event',
+        '_logon_time_range',
+        'logon_timeout',
+        '_tz',
+        'time_provider',
+        '_fix_message_factory',
+        '_last_send_time',
+        '_store',
+        '_session',
+        '_send',
+        '_receive',
+        '_logout_time',
+        '_logout_deadline',
+        '_admin_state_machine',
+        '_transport_state_machine',
+        '_log_heartbeats',
+        '_heartbeat_template'
+    )
+
     def __init__(
             self,
             app: FIXApplication,
@@ -49,7 +93,11 @@ class AcceptorEngine(AbstractAcceptorEngine):
             logon_time_range: Optional[Tuple[time, time]] = None,
             logon_timeout: Union[float, int] = 60,
             tz: Optional[tzinfo] = None,
-            time_provider: Optional[TimeProvider] = None
+            time_provider: Optional[TimeProvider] = None,
+            bypass_parsing: bool = False,
+            save_interval: Optional[float] = None,
+            log_heartbeats: bool = False,
+            validate: bool = True
     ) -> None:
         self.protocol = protocol
         self.sender_comp_id = sender_comp_id
@@ -61,18 +109,29 @@ class AcceptorEngine(AbstractAcceptorEngine):
         self.logon_timeout = logon_timeout
         self._tz = tz
         self.time_provider = time_provider or DefaultTimeProvider()
+        self._log_heartbeats = log_heartbeats
+        # A transport which frames with a validating FixReadBuffer has
+        # already checked received messages, and passes validate=False.
         self._fix_message_factory = FixMessageFactory(
             protocol,
             sender_comp_id,
-            target_comp_id
+            target_comp_id,
+            validate=validate
+        )
+        self._heartbeat_template = FixMessageTemplate(
+            self._fix_message_factory,
+            'HEARTBEAT'
         )
 
-        self._last_send_time_utc: Optional[datetime] = None
+        self._last_send_time: Optional[float] = None
         self._store = store
         self._session = self._store.get_session(sender_comp_id, target_comp_id)
-        self._send: Optional[Send] = None
+        self._send: Send = _send_not_connected
         self._receive: Optional[Receive] = None
         self._logout_time: Optional[datetime] = None
+        # The logout time on the monotonic clock, so the check made on every
+        # loop does not need the wall clock.
+        self._logout_deadline: Optional[float] = None
 
         self._admin_state_machine = AcceptorAdminStateMachine(
             self,
@@ -84,7 +143,10 @@ class AcceptorEngine(AbstractAcceptorEngine):
             self,
             app,
             self._admin_state_machine,
-            self.time_provider
+            self.time_provider,
+            bypass_parsing=bypass_parsing,
+            save_interval=save_interval,
+            log_heartbeats=log_heartbeats
         )
 
     @property
@@ -114,6 +176,12 @@ class AcceptorEngine(AbstractAcceptorEngine):
     @logout_time.setter
     def logout_time(self, value: datetime) -> None:
         self._logout_time = value
+        seconds_till_logout = (
+            value - self.time_provider.now(self._tz or _UTC)
+        ).total_seconds()
+        self._logout_deadline = (
+            self.time_provider.monotonic() + seconds_till_logout
+        )
 
     @property
     def tz(self) -> Optional[tzinfo]:
@@ -127,13 +195,19 @@ class AcceptorEngine(AbstractAcceptorEngine):
 
     async def _next_transport_message(
             self,
-            receive: Receive
+            receive: Receive,
+            receive_nowait: Optional[ReceiveNowait]
     ) -> TransportMessage:
         try:
             timeout = await self._send_heartbeat_if_required()
-            return await asyncio.wait_for(receive(), timeout=timeout)
+            # Only arm the timeout when there is nothing queued.
+            if receive_nowait is not None:
+                transport_message = receive_nowait()
+                if transport_message is not None:
+                    return transport_message
+            return await wait_with_timeout(receive(), timeout)
         except asyncio.TimeoutError:
-            return TransportMessage(TransportEvent.TIMEOUT_RECEIVED)
+            return _TIMEOUT_RECEIVED
 
     async def __call__(
             self,
@@ -141,43 +215,67 @@ class AcceptorEngine(AbstractAcceptorEngine):
             receive: Receive
     ) -> None:
         self._send, self._receive = send, receive
+        # Transports may offer a way to take messages that are already queued.
+        receive_nowait: Optional[ReceiveNowait] = getattr(
+            receive,
+            'nowait',
+            None
+        )
 
-        while True:
-            await self._send_logout_if_login_expired(self._logout_time)
-            transport_message = await self._next_transport_message(receive)
-            await self._transport_state_machine.process(transport_message)
-            if self._transport_state_machine.state != TransportState.CONNECTED:
-                break
+        try:
+            while True:
+                await self._send_logout_if_login_expired()
+                transport_message = await self._next_transport_message(
+                    receive,
+                    receive_nowait
+                )
+                await self._transport_state_machine.process(transport_message)
+                if receive_nowait is not None:
+                    await self._process_received(receive_nowait)
+                if self._transport_state_machine.state is not TransportState.CONNECTED:
+                    break
+        finally:
+            # Save any queued messages, even when the engine is cancelled.
+            await self._transport_state_machine.flush()
 
         LOGGER.info('disconnected')
 
-    async def _send_logout_if_login_expired(
-            self,
-            logout_time: Optional[datetime]
-    ) -> None:
-        if self._admin_state_machine.state != AdminState.AUTHENTICATED or not logout_time:
+    async def _process_received(self, receive_nowait: ReceiveNowait) -> None:
+        # Handle messages that are already queued without waiting.
+        for _ in range(_MAX_BATCH_SIZE - 1):
+            if self._transport_state_machine.state is not TransportState.CONNECTED:
+                return
+            transport_message = receive_nowait()
+            if transport_message is None:
+                return
+            await self._transport_state_machine.process(transport_message)
+
+    async def _send_logout_if_login_expired(self) -> None:
+        if (
+                self._logout_deadline is None or
+                self._admin_state_machine.state is not AdminState.AUTHENTICATED
+        ):
             return
 
         # Is it time to logout?
-        if self.time_provider.now(self._tz or timezone.utc) >= logout_time:
+        if self.time_provider.monotonic() >= self._logout_deadline:
             await self._admin_state_machine.process(
                 AdminMessage(AdminEvent.SEND_LOGOUT)
             )
 
     async def _send_heartbeat_if_required(self) -> float:
         if (
-                self._transport_state_machine.state != TransportState.CONNECTED
-                or self._last_send_time_utc is None
+                self._transport_state_machine.state is not TransportState.CONNECTED
+                or self._last_send_time is None
         ):
             return self.logon_timeout
 
-        now_utc = self.time_provider.now(timezone.utc)
         seconds_since_last_send = (
-            now_utc - self._last_send_time_utc
-        ).total_seconds()
+            self.time_provider.monotonic() - self._last_send_time
+        )
         if (
                 seconds_since_last_send >= self._heartbeat_timeout and
-                self._admin_state_machine.state == AdminState.AUTHENTICATED
+                self._admin_state_machine.state is AdminState.AUTHENTICATED
         ):
             await self.send_message('HEARTBEAT')
             seconds_since_last_send = 0
@@ -186,12 +284,6 @@ class AcceptorEngine(AbstractAcceptorEngine):
 
         return seconds_till_next_heartbeat
 
-    async def _next_outgoing_seqnum(self) -> int:
-        seqnum = await self._session.get_outgoing_seqnum()
-        seqnum += 1
-        await self._session.set_outgoing_seqnum(seqnum)
-        return seqnum
-
     async def _set_seqnums(
             self,
             outgoing_seqnum: int,
@@ -199,16 +291,6 @@ class AcceptorEngine(AbstractAcceptorEngine):
     ) -> None:
         await self._session.set_seqnums(outgoing_seqnum, incoming_seqnum)
 
-    async def _send_transport_message(
-            self,
-            transport_message: TransportMessage,
-            send_time_utc: datetime
-    ) -> None:
-        if self._send is None:
-            raise ValueError("Not connected")
-        await self._send(transport_message)
-        self._last_send_time_utc = send_time_utc
-
     async def send_message(
             self,
             msg_type: str,
@@ -221,22 +303,28 @@ class AcceptorEngine(AbstractAcceptorEngine):
             message (Optional[Mapping[str, Any]], optional): The message.
                 Defaults to None.
         """
-        send_time_utc = self.time_provider.now(timezone.utc)
-        msg_seq_num = await self._next_outgoing_seqnum()
-        fix_message = self.fix_message_factory.create(
-            msg_type,
-            msg_seq_num,
-            send_time_utc,
-            message
-        )
-        LOGGER.info('Sending %s', fix_message.message)
-
-        buffer = fix_message.encode(regenerate_integrity=True)
-        transport_message = TransportMessage(
-            TransportEvent.FIX_RECEIVED,
-            buffer
-        )
-        await self._send_transport_message(transport_message, send_time_utc)
+        send_time_utc = self.time_provider.now(_UTC)
+        msg_seq_num = await self._session.increment_outgoing_seqnum()
+        if msg_type == 'HEARTBEAT' and message is None:
+            buffer = self._heartbeat_template.encode(msg_seq_num, send_time_utc)
+            if self._log_heartbeats and LOGGER.isEnabledFor(logging.INFO):
+                LOGGER.info('Sending %s', RawFixMessage(buffer))
+        else:
+            fix_message = self.fix_message_factory.create(
+                msg_type,
+                msg_seq_num,
+                send_time_utc,
+                message
+            )
+            if (
+                    (self._log_heartbeats or msg_type != 'HEARTBEAT') and
+                    LOGGER.isEnabledFor(logging.INFO)
+            ):
+                LOGGER.info('Sending %s', fix_message.message)
+            buffer = fix_message.encode(regenerate_integrity=True)
+
+        await self._send(buffer)
+        self._last_send_time = self.time_provider.monotonic()
 
     async def send_resend_request(
             self,
@@ -11,6 +11,7 @@ from ..transports import (
 )
 from ..types import FIXApplication
 from ..utils.cancellation import register_cancellation_event
+from ..utils.sockets import configure_socket
 
 from .acceptor import AcceptorEngine
 from .types import AcceptorConfig
@@ -33,6 +34,13 @@ async def start_acceptor(
     async def accept(reader: StreamReader, writer: StreamWriter) -> None:
         LOGGER.info("Accepting initiator")
 
+        configure_socket(
+            writer,
+            tcp_nodelay=config.tcp_nodelay,
+            send_buffer_size=config.send_buffer_size,
+            receive_buffer_size=config.receive_buffer_size
+        )
+
         read_buffer = FixReadBuffer(
             config.sep,
             config.convert_sep_to_soh_for_checksum,
@@ -49,7 +57,12 @@ async def start_acceptor(
             cancellation_event,
             heartbeat_threshold=config.heartbeat_threshold,
             logon_time_range=config.logon_time_range,
-            tz=config.tz
+            tz=config.tz,
+            bypass_parsing=config.bypass_parsing,
+            save_interval=config.save_interval,
+            log_heartbeats=config.log_heartbeats,
+            # The read buffer checks received messages when configured to.
+            validate=False,
         )
         await fix_stream_processor(
             handler,
@@ -76,5 +89,8 @@ async def start_acceptor(
         ssl=config.ssl
     )
 
-    async with server:
-        await server.serve_forever()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await config.store.aclose()
@@ -11,6 +11,7 @@ from ..admin import (
     AdminMessage,
     AdminState,
     AdminStateProcessor,
+    reject_missing_field,
 )
 from ..time_provider import TimeProvider
 from ..types import FIXApplication, LoginError
@@ -21,10 +22,31 @@ from .types import AbstractAcceptorEngine
 
 LOGGER = logging.getLogger(__name__)
 
+# Handler results without a FIX message are shared. Nothing mutates an
+# AdminMessage after it is created.
+_LOGON_ACCEPTED = AdminMessage(AdminEvent.LOGON_ACCEPTED)
+_LOGON_REJECTED = AdminMessage(AdminEvent.LOGON_REJECTED)
+_TEST_REQUEST_SENT = AdminMessage(AdminEvent.TEST_REQUEST_SENT)
+_SEQUENCE_RESET_SENT = AdminMessage(AdminEvent.SEQUENCE_RESET_SENT)
+_INCOMING_SEQNUM_SET = AdminMessage(AdminEvent.INCOMING_SEQNUM_SET)
+_TEST_HEARTBEAT_SENT = AdminMessage(AdminEvent.TEST_HEARTBEAT_SENT)
+_TEST_HEARTBEAT_VALID = AdminMessage(AdminEvent.TEST_HEARTBEAT_VALID)
+_TEST_HEARTBEAT_INVALID = AdminMessage(AdminEvent.TEST_HEARTBEAT_INVALID)
+
 
 class AcceptorAdminStateMachine(AdminStateProcessor):
     """The admin state machine for an acceptor"""
 
+    __slots__ = (
+        '_engine',
+        '_app',
+        '_time_provider',
+        '_cancellation_event',
+        '_test_heartbeat_message',
+        '_test_heartbeat_prefix',
+        '_test_heartbeat_count'
+    )
+
     def __init__(
             self,
             engine: AbstractAcceptorEngine,
@@ -67,6 +89,10 @@ class AcceptorAdminStateMachine(AdminStateProcessor):
         self._time_provider = time_provider
         self._cancellation_event = cancellation_event
         self._test_heartbeat_message: Optional[str] = None
+        # Test request ids are numbered from a per-session random prefix
+        # rather than drawing a new uuid each time.
+        self._test_heartbeat_prefix = uuid.uuid4().hex
+        self._test_heartbeat_count = 0
 
     async def _handle_connected(
             self,
@@ -94,13 +120,13 @@ class AcceptorAdminStateMachine(AdminStateProcessor):
     ) -> Optional[AdminMessage]:
         try:
             await self._app.on_logon(admin_message.fix, self._engine)
-            return AdminMessage(AdminEvent.LOGON_ACCEPTED)
+            return _LOGON_ACCEPTED
         except LoginError:
             LOGGER.info("Logon rejected")
         except:  # pylint: disable=bare-except
             LOGGER.exception("Logon failed")
 
-        return AdminMessage(AdminEvent.LOGON_REJECTED)
+        return _LOGON_REJECTED
 
     async def _send_logon(
             self,
@@ -134,8 +160,16 @@ class AcceptorAdminStateMachine(AdminStateProcessor):
             self,
             admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
-        assert 'TestReqID' in admin_message.fix
-        test_req_id = admin_message.fix['TestReqID']
+        test_req_id = admin_message.fix.get('TestReqID')
+        if test_req_id is None:
+            # The reject answers the request.
+            await reject_missing_field(
+                self._engine,
+                admin_message.fix,
+                'TestReqID'
+            )
+            return _TEST_REQUEST_SENT
+
         await self._engine.send_message(
             'TEST_REQUEST',
             {
@@ -143,7 +177,7 @@ class AcceptorAdminStateMachine(AdminStateProcessor):
             }
         )
 
-        return AdminMessage(AdminEvent.TEST_REQUEST_SENT)
+        return _TEST_REQUEST_SENT
 
     async def _send_sequence_reset(
             self,
@@ -158,16 +192,24 @@ class AcceptorAdminStateMachine(AdminStateProcessor):
             }
         )
 
-        return AdminMessage(AdminEvent.SEQUENCE_RESET_SENT)
+        return _SEQUENCE_RESET_SENT
 
     async def _handle_sequence_reset(
             self,
             admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
-        assert 'NewSeqNo' in admin_message.fix
-        seqnum = admin_message.fix['NewSeqNo']
+        seqnum = admin_message.fix.get('NewSeqNo')
+        if seqnum is None:
+            # The incoming seqnum is left as it was.
+            await reject_missing_field(
+                self._engine,
+                admin_message.fix,
+                'NewSeqNo'
+            )
+            return _INCOMING_SEQNUM_SET
+
         await self._engine.session.set_incoming_seqnum(seqnum)
-        return AdminMessage(AdminEvent.INCOMING_SEQNUM_SET)
+        return _INCOMING_SEQNUM_SET
 
     async def _receive_logout(
             self,
@@ -180,7 +222,10 @@ class AcceptorAdminStateMachine(AdminStateProcessor):
             self,
             _admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
-        self._test_heartbeat_message = str(uuid.uuid4())
+        self._test_heartbeat_count += 1
+        self._test_heartbeat_message = (
+            f'{self._test_heartbeat_prefix}-{self._test_heartbeat_count}'
+        )
 
         await self._engine.send_message(
             'TEST_REQUEST',
@@ -188,14 +233,13 @@ class AcceptorAdminStateMachine(AdminStateProcessor):
                 'TestReqID': self._test_heartbeat_message
             }
         )
-        return AdminMessage(AdminEvent.TEST_HEARTBEAT_SENT)
+        return _TEST_HEARTBEAT_SENT
 
     async def _validate_test_heartbeat(
             self,
             admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
-        assert 'TestReqID' in admin_message.fix
-        if admin_message.fix['TestReqID'] == self._test_heartbeat_message:
-            return AdminMessage(AdminEvent.TEST_HEARTBEAT_VALID)
+        if admin_message.fix.get('TestReqID') == self._test_heartbeat_message:
+            return _TEST_HEARTBEAT_VALID
         else:
-            return AdminMessage(AdminEvent.TEST_HEARTBEAT_INVALID)
+            return _TEST_HEARTBEAT_INVALID
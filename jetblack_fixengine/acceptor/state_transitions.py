@@ -1,10 +1,11 @@
 """Admin state transitions"""
 
+from types import MappingProxyType
 from typing import Mapping
 
 from ..admin.state_processor import AdminEvent, AdminState
 
-ACCEPTOR_ADMIN_TRANSITIONS: Mapping[AdminState, Mapping[AdminEvent, AdminState]] = {
+_TRANSITIONS: Mapping[AdminState, Mapping[AdminEvent, AdminState]] = {
     AdminState.DISCONNECTED: {
         AdminEvent.CONNECTED: AdminState.LOGON_EXPECTED
     },
@@ -43,3 +44,9 @@ ACCEPTOR_ADMIN_TRANSITIONS: Mapping[AdminState, Mapping[AdminEvent, AdminState]]
         AdminEvent.TEST_HEARTBEAT_INVALID: AdminState.REJECT_LOGON
     }
 }
+
+# Every acceptor shares the table, so it is read only.
+ACCEPTOR_ADMIN_TRANSITIONS: Mapping[AdminState, Mapping[AdminEvent, AdminState]] = MappingProxyType({
+    state: MappingProxyType(transitions)
+    for state, transitions in _TRANSITIONS.items()
+})
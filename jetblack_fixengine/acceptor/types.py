@@ -1,6 +1,5 @@
 """Types"""
 
-from abc import ABCMeta, abstractmethod
 from datetime import datetime, time, tzinfo
 from ssl import SSLContext
 from typing import Optional, Tuple
@@ -11,23 +10,25 @@ from jetblack_fixparser.meta_data import ProtocolMetaData
 from ..types import FIXEngine, Store
 
 
-class AbstractAcceptorEngine(FIXEngine, metaclass=ABCMeta):
+class AbstractAcceptorEngine(FIXEngine):
     """The interface for an acceptor"""
 
+    __slots__ = ()
+
     @property
-    @abstractmethod
     def logon_time_range(self) -> Optional[Tuple[time, time]]:
         """The logon time range"""
+        raise NotImplementedError
 
     @property
-    @abstractmethod
     def logout_time(self) -> Optional[datetime]:
         """The logout time"""
+        raise NotImplementedError
 
     @logout_time.setter
-    @abstractmethod
     def logout_time(self, value: datetime) -> None:
         """The logout time setter"""
+        raise NotImplementedError
 
     @property
     def tz(self) -> Optional[tzinfo]:
@@ -37,6 +38,30 @@ class AbstractAcceptorEngine(FIXEngine, metaclass=ABCMeta):
 class AcceptorConfig:
     """The acceptor configuration"""
 
+    __slots__ = (
+        'host',
+        'port',
+        'protocol',
+        'sender_comp_id',
+        'target_comp_id',
+        'store',
+        'ssl',
+        'client_shutdown_timeout',
+        'sep',
+        'convert_sep_to_soh_for_checksum',
+        'validate',
+        'heartbeat_timeout',
+        'heartbeat_threshold',
+        'logon_time_range',
+        'tz',
+        'bypass_parsing',
+        'save_interval',
+        'log_heartbeats',
+        'tcp_nodelay',
+        'send_buffer_size',
+        'receive_buffer_size'
+    )
+
     def __init__(
             self,
             host: str,
@@ -54,7 +79,13 @@ class AcceptorConfig:
             heartbeat_timeout: int = 30,
             heartbeat_threshold: int = 1,
             logon_time_range: Optional[Tuple[time, time]] = None,
-            tz: Optional[tzinfo] = None
+            tz: Optional[tzinfo] = None,
+            bypass_parsing: bool = False,
+            save_interval: Optional[float] = None,
+            log_heartbeats: bool = False,
+            tcp_nodelay: bool = True,
+            send_buffer_size: Optional[int] = None,
+            receive_buffer_size: Optional[int] = None
     ) -> None:
         self.host = host
         self.port = port
@@ -71,3 +102,9 @@ class AcceptorConfig:
         self.heartbeat_threshold = heartbeat_threshold
         self.logon_time_range = logon_time_range
         self.tz = tz
+        self.bypass_parsing = bypass_parsing
+        self.save_interval = save_interval
+        self.log_heartbeats = log_heartbeats
+        self.tcp_nodelay = tcp_nodelay
+        self.send_buffer_size = send_buffer_size
+        self.receive_buffer_size = receive_buffer_size
@@ -1,5 +1,6 @@
 """Admin"""
 
+from .reject import reject_missing_field
 from .state_processor import AdminStateProcessor
 from .types import AdminEvent, AdminMessage, AdminState
 
@@ -9,4 +10,6 @@ __all__ = [
     'AdminEvent',
     'AdminMessage',
     'AdminState',
+
+    'reject_missing_field',
 ]
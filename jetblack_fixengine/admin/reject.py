@@ -0,0 +1,36 @@
+"""Admin message rejection"""
+
+import logging
+from typing import Any, Mapping
+
+from ..types import FIXEngine
+
+LOGGER = logging.getLogger(__name__)
+
+
+async def reject_missing_field(
+        engine: FIXEngine,
+        message: Mapping[str, Any],
+        field: str
+) -> None:
+    """Send a Reject for a received message without a required field.
+
+    Only RefSeqNum and Text are set, as every protocol version has them.
+
+    Args:
+        engine (FIXEngine): The engine which received the message.
+        message (Mapping[str, Any]): The received message.
+        field (str): The name of the missing field.
+    """
+    LOGGER.warning(
+        'Rejecting %s without %s',
+        message.get('MsgType'),
+        field
+    )
+    await engine.send_message(
+        'REJECT',
+        {
+            'RefSeqNum': message['MsgSeqNum'],
+            'Text': f'Required tag missing: {field}'
+        }
+    )
@@ -11,16 +11,27 @@ from .types import AdminEvent, AdminState
 
 LOGGER = logging.getLogger(__name__)
 
+_NO_TRANSITIONS: Mapping[AdminEvent, AdminState] = {}
+
 
 class AdminStateTransition:
     """State machine for the admin messages"""
 
+    __slots__ = ('transitions', 'state', '_transitions', '_state_transitions')
+
     def __init__(
             self,
             transitions: Mapping[AdminState, Mapping[AdminEvent, AdminState]]
     ) -> None:
         self.transitions = transitions
         self.state = AdminState.DISCONNECTED
+        # Every state has a row, so finding the next one needs no default.
+        self._transitions = {
+            state: transitions.get(state, _NO_TRANSITIONS)
+            for state in AdminState
+        }
+        # The transitions from the current state.
+        self._state_transitions = self._transitions[self.state]
 
     def transition(self, event: AdminEvent) -> AdminState:
         """Transition to a new state.
@@ -34,16 +45,18 @@ class AdminStateTransition:
         Returns:
             AdminState: The new state.
         """
-        LOGGER.debug('Transition from %s with %s', self.state, event)
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug('Transition from %r with %r', self.state, event)
         try:
-            self.state = self.transitions[self.state][event]
-            return self.state
+            self.state = self._state_transitions[event]
         except KeyError as error:
             raise InvalidStateTransitionError(
-                f'unhandled event {self.state.name} -> {event}.',
+                f'unhandled event {self.state.name} -> {event.name}.',
             ) from error
+        self._state_transitions = self._transitions[self.state]
+        return self.state
 
     def __str__(self) -> str:
-        return f"AdminStateMachine: state={self.state}"
+        return f"AdminStateMachine: state={self.state.name}"
 
     __repr__ = __str__
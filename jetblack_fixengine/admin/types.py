@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from enum import Enum, auto
-from typing import Any, Awaitable, Callable, Mapping, Optional, cast
+from enum import IntEnum, auto
+from typing import Any, Awaitable, Callable, Mapping, Optional, Tuple
 
 
-class AdminState(Enum):
+class AdminState(IntEnum):
     """Admin states"""
     DISCONNECTED = auto()
     LOGON_REQUESTED = auto()
@@ -27,7 +27,7 @@ class AdminState(Enum):
     SET_INCOMING_SEQNUM = auto()
 
 
-class AdminEvent(Enum):
+class AdminEvent(IntEnum):
     """Admin events"""
     CONNECTED = auto()
     LOGON_SENT = auto()
@@ -52,8 +52,8 @@ class AdminEvent(Enum):
     TEST_HEARTBEAT_INVALID = auto()
     XML_MESSAGE_RECEIVED = auto()
 
-    @classmethod
-    def from_msg_type(cls, msg_type: str) -> AdminEvent:
+    @staticmethod
+    def from_msg_type(msg_type: str) -> AdminEvent:
         """Convert from a FIX message type.
 
         Args:
@@ -65,39 +65,39 @@ class AdminEvent(Enum):
         Returns:
             AdminEvent: The event.
         """
-        if msg_type == 'LOGON':
-            return cls.LOGON_RECEIVED
-        elif msg_type == 'LOGOUT':
-            return cls.LOGOUT_RECEIVED
-        elif msg_type == 'REJECT':
-            return cls.REJECT_RECEIVED
-        elif msg_type == 'HEARTBEAT':
-            return cls.HEARTBEAT_RECEIVED
-        elif msg_type == 'TEST_REQUEST':
-            return cls.TEST_REQUEST_RECEIVED
-        elif msg_type == 'RESEND_REQUEST':
-            return cls.RESEND_REQUEST_RECEIVED
-        elif msg_type == 'SEQUENCE_RESET':
-            return cls.SEQUENCE_RESET_RECEIVED
-        elif msg_type == 'XML_MESSAGE':
-            return cls.XML_MESSAGE_RECEIVED
-        else:
-            raise ValueError(f'invalid msg_type "{msg_type}"')
+        try:
+            return _MSG_TYPE_TO_ADMIN_EVENT[msg_type]
+        except KeyError as error:
+            raise ValueError(f'invalid msg_type "{msg_type}"') from error
+
+
+_MSG_TYPE_TO_ADMIN_EVENT: Mapping[str, AdminEvent] = {
+    'LOGON': AdminEvent.LOGON_RECEIVED,
+    'LOGOUT': AdminEvent.LOGOUT_RECEIVED,
+    'REJECT': AdminEvent.REJECT_RECEIVED,
+    'HEARTBEAT': AdminEvent.HEARTBEAT_RECEIVED,
+    'TEST_REQUEST': AdminEvent.TEST_REQUEST_RECEIVED,
+    'RESEND_REQUEST': AdminEvent.RESEND_REQUEST_RECEIVED,
+    'SEQUENCE_RESET': AdminEvent.SEQUENCE_RESET_RECEIVED,
+    'XML_MESSAGE': AdminEvent.XML_MESSAGE_RECEIVED,
+}
 
 
 class AdminMessage:
     """An admin message"""
 
+    __slots__ = ('event', 'fix')
+
     def __init__(
             self,
             event: AdminEvent,
             fix: Optional[Mapping[str, Any]] = None
     ) -> None:
         self.event = event
-        self.fix = fix if fix is not None else cast(Mapping[str, Any], {})
+        self.fix: Mapping[str, Any] = fix if fix is not None else {}
 
     def __str__(self) -> str:
-        return f'{self.event}: {self.fix}'
+        return f'{self.event.name}: {self.fix}'
 
 
 AdminEventHandler = Callable[
@@ -108,3 +108,7 @@ AdminEventHandlerMapping = Mapping[
     AdminState,
     Mapping[AdminEvent, AdminEventHandler]
 ]
+AdminDispatchMapping = Mapping[
+    AdminState,
+    Mapping[AdminEvent, Tuple[Optional[AdminEventHandler], AdminState]]
+]
@@ -0,0 +1,130 @@
+"""A FIX message template"""
+
+from datetime import datetime, timezone
+from typing import Any, List, Mapping, Optional, Tuple
+
+from jetblack_fixparser.fix_message import FixMessageFactory, SOH
+
+_UTCTIMESTAMP_FMT = '%Y%m%d-%H:%M:%S'
+
+
+def _join(fields: List[bytes]) -> bytes:
+    return b''.join(field + SOH for field in fields)
+
+
+class FixMessageTemplate:
+    """A FIX message where only the MsgSeqNum and SendingTime change.
+
+    The message is encoded once with the factory. After that, encoding
+    only fills in the sequence number and sending time. The body length and
+    checksum are then updated from precomputed totals for the fixed parts,
+    so the fixed bytes are never summed again. The sending time is formatted
+    once per second, and only the milliseconds are added for each message.
+    """
+
+    __slots__ = (
+        '_header',
+        '_prefix',
+        '_middle',
+        '_suffix',
+        '_is_millis',
+        '_fixed_length',
+        '_fixed_sum',
+        '_second',
+        '_second_timestamp'
+    )
+
+    def __init__(
+            self,
+            factory: FixMessageFactory,
+            msg_type: str,
+            message: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        """Initialise the template.
+
+        Args:
+            factory (FixMessageFactory): The factory used to encode the
+                message.
+            msg_type (str): The message type.
+            message (Optional[Mapping[str, Any]], optional): The message body.
+                Defaults to None.
+        """
+        buffer = factory.create(
+            msg_type,
+            0,
+            datetime(1970, 1, 1, tzinfo=timezone.utc),
+            message
+        ).encode(regenerate_integrity=True)
+        fields = buffer.split(SOH)[:-1]
+        # Drop the BeginString, BodyLength and CheckSum fields.
+        body = fields[2:-1]
+        tags = [field.split(b'=', 1)[0] for field in body]
+        seqnum_index, time_index = tags.index(b'34'), tags.index(b'52')
+        assert seqnum_index < time_index
+
+        self._header = fields[0] + SOH + b'9='
+        self._prefix = _join(body[:seqnum_index]) + b'34='
+        self._middle = (
+            SOH +
+            _join(body[seqnum_index + 1:time_index]) +
+            b'52='
+        )
+        self._suffix = SOH + _join(body[time_index + 1:])
+        self._is_millis = factory.protocol.is_millisecond_time
+        self._fixed_length = (
+            len(self._prefix) + len(self._middle) + len(self._suffix)
+        )
+        self._fixed_sum = sum(
+            self._header + SOH + self._prefix + self._middle + self._suffix
+        )
+        self._second: Tuple[int, ...] = ()
+        self._second_timestamp = b''
+
+    def encode(self, msg_seq_num: int, sending_time: datetime) -> bytes:
+        """Encode the message.
+
+        Args:
+            msg_seq_num (int): The message sequence number.
+            sending_time (datetime): The sending time.
+
+        Returns:
+            bytes: The FIX bytes buffer.
+        """
+        second = (
+            sending_time.second,
+            sending_time.minute,
+            sending_time.hour,
+            sending_time.day,
+            sending_time.month,
+            sending_time.year
+        )
+        if second != self._second:
+            self._second = second
+            self._second_timestamp = sending_time.strftime(
+                _UTCTIMESTAMP_FMT
+            ).encode()
+        if self._is_millis:
+            timestamp = self._second_timestamp + b'.%03d' % (
+                sending_time.microsecond // 1000
+            )
+        else:
+            timestamp = self._second_timestamp
+        seqnum = b'%d' % msg_seq_num
+        body_length = b'%d' % (
+            self._fixed_length + len(seqnum) + len(timestamp)
+        )
+        checksum = (
+            self._fixed_sum + sum(body_length) + sum(seqnum) + sum(timestamp)
+        ) % 256
+        return b''.join((
+            self._header,
+            body_length,
+            SOH,
+            self._prefix,
+            seqnum,
+            self._middle,
+            timestamp,
+            self._suffix,
+            b'10=%03d' % checksum,
+            SOH
+        ))
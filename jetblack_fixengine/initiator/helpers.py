@@ -11,6 +11,7 @@ from jetblack_fixparser.fix_message import SOH
 from ..transports import TransportHandler
 from ..types import FIXApplication
 from ..utils.cancellation import register_cancellation_event
+from ..utils.sockets import configure_socket
 
 from ..transports import FixReadBuffer, fix_read_async, fix_stream_processor
 
@@ -30,7 +31,10 @@ async def initiate(
         shutdown_timeout: float = 10.0,
         sep: bytes = SOH,
         convert_sep_to_soh_for_checksum: bool = False,
-        validate: bool = True
+        validate: bool = True,
+        tcp_nodelay: bool = True,
+        send_buffer_size: Optional[int] = None,
+        receive_buffer_size: Optional[int] = None
 ) -> None:
     LOGGER.info(
         'connecting to %s:%s%s',
@@ -40,6 +44,12 @@ async def initiate(
     )
 
     reader, writer = await asyncio.open_connection(host, port, ssl=ssl)
+    configure_socket(
+        writer,
+        tcp_nodelay=tcp_nodelay,
+        send_buffer_size=send_buffer_size,
+        receive_buffer_size=receive_buffer_size
+    )
     read_buffer = FixReadBuffer(sep, convert_sep_to_soh_for_checksum, validate)
     buffered_reader = fix_read_async(read_buffer, reader, 1024)
     await fix_stream_processor(
@@ -72,23 +82,25 @@ async def start_initiator(
     loop = asyncio.get_event_loop()
     register_cancellation_event(cancellation_event, loop)
 
-    engine = InitiatorEngine(
+    # The read buffer created by initiate checks received messages.
+    engine = InitiatorEngine.from_config(
         app,
-        config.protocol,
-        config.sender_comp_id,
-        config.target_comp_id,
-        config.store,
-        config.logon_timeout,
-        config.heartbeat_timeout,
+        config,
         cancellation_event,
-        heartbeat_threshold=config.heartbeat_threshold
+        validate=False
     )
 
-    await initiate(
-        config.host,
-        config.port,
-        engine,
-        cancellation_event,
-        ssl=config.ssl,
-        shutdown_timeout=config.shutdown_timeout
-    )
+    try:
+        await initiate(
+            config.host,
+            config.port,
+            engine,
+            cancellation_event,
+            ssl=config.ssl,
+            shutdown_timeout=config.shutdown_timeout,
+            tcp_nodelay=config.tcp_nodelay,
+            send_buffer_size=config.send_buffer_size,
+            receive_buffer_size=config.receive_buffer_size
+        )
+    finally:
+        await config.store.aclose()
@@ -1,14 +1,18 @@
 """An Initiator"""
 
+from __future__ import annotations
+
 import asyncio
-from datetime import datetime, timezone
+from datetime import timezone
 import logging
-from typing import Mapping, Any, Optional
+from typing import Mapping, Any, Optional, Union
 
 from jetblack_fixparser.fix_message import FixMessageFactory
 from jetblack_fixparser.meta_data import ProtocolMetaData
 
 from ..admin import AdminState
+from ..fix_message_template import FixMessageTemplate
+from ..raw_fix_message import RawFixMessage
 from ..time_provider import TimeProvider, DefaultTimeProvider
 from ..transports import (
     TransportEvent,
@@ -17,18 +21,54 @@ from ..transports import (
     TransportStateMachine,
     Send,
     Receive,
+    ReceiveNowait,
 )
 from ..types import FIXApplication, Session, Store
+from ..utils.timeouts import wait_with_timeout
 
 from .state_machine import InitiatorAdminStateMachine
-from .types import AbstractInitiatorEngine
+from .types import AbstractInitiatorEngine, InitiatorConfig
 
 LOGGER = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
+# Returned on every receive timeout. It is never mutated, so it is shared.
+_TIMEOUT_RECEIVED = TransportMessage(TransportEvent.TIMEOUT_RECEIVED)
+
+# The most messages to handle from the receive queue before checking
+# heartbeats again.
+_MAX_BATCH_SIZE = 32
+
+
+async def _send_not_connected(
+        _transport_message: Union[TransportMessage, bytes]
+) -> None:
+    raise ValueError('Not connected')
+
 
 class InitiatorEngine(AbstractInitiatorEngine):
     """The base class for initiator handlers"""
 
+    __slots__ = (
+        'logon_timeout',
+        '_heartbeat_timeout',
+        '_heartbeat_threshold',
+        '_cancellation_event',
+        '_fix_message_factory',
+        '_time_provider',
+        '_last_send_time',
+        '_session',
+        '_send',
+        '_receive',
+        '_timeout',
+        '_admin_state_machine',
+        '_transport_state_machine',
+        '_run_task',
+        '_log_heartbeats',
+        '_heartbeat_template'
+    )
+
     def __init__(
             self,
             app: FIXApplication,
@@ -41,22 +81,34 @@ class InitiatorEngine(AbstractInitiatorEngine):
             cancellation_event: asyncio.Event,
             *,
             heartbeat_threshold: int = 1,
-            time_provider: Optional[TimeProvider] = None
+            time_provider: Optional[TimeProvider] = None,
+            bypass_parsing: bool = False,
+            save_interval: Optional[float] = None,
+            log_heartbeats: bool = False,
+            validate: bool = True
     ) -> None:
         self.logon_timeout = logon_timeout
         self._heartbeat_timeout = heartbeat_timeout
         self._heartbeat_threshold = heartbeat_threshold
         self._cancellation_event = cancellation_event
+        # A transport which frames with a validating FixReadBuffer has
+        # already checked received messages, and passes validate=False.
         self._fix_message_factory = FixMessageFactory(
             protocol,
             sender_comp_id,
-            target_comp_id
+            target_comp_id,
+            validate=validate
+        )
+        self._heartbeat_template = FixMessageTemplate(
+            self._fix_message_factory,
+            'HEARTBEAT'
         )
         self._time_provider = time_provider or DefaultTimeProvider()
+        self._log_heartbeats = log_heartbeats
 
-        self._last_send_time_utc = self._time_provider.min(timezone.utc)
+        self._last_send_time = float('-inf')
         self._session = store.get_session(sender_comp_id, target_comp_id)
-        self._send: Optional[Send] = None
+        self._send: Send = _send_not_connected
         self._receive: Optional[Receive] = None
         self._timeout = float(heartbeat_timeout)
 
@@ -69,9 +121,51 @@ class InitiatorEngine(AbstractInitiatorEngine):
             app,
             self._admin_state_machine,
             self._time_provider,
+            bypass_parsing=bypass_parsing,
+            save_interval=save_interval,
+            log_heartbeats=log_heartbeats
         )
 
-        self._stop_event = asyncio.Event()
+        self._run_task: Optional['asyncio.Task[Any]'] = None
+
+    @classmethod
+    def from_config(
+            cls,
+            app: FIXApplication,
+            config: InitiatorConfig,
+            cancellation_event: asyncio.Event,
+            *,
+            validate: bool = True
+    ) -> InitiatorEngine:
+        """Create an initiator from its configuration.
+
+        Args:
+            app (FIXApplication): The FIX application.
+            config (InitiatorConfig): The initiator configuration.
+            cancellation_event (asyncio.Event): An event to cancel the
+                initiator.
+            validate (bool, optional): If true check received messages when
+                decoding them. Pass False when the transport has already
+                checked them. Defaults to True.
+
+        Returns:
+            InitiatorEngine: The initiator.
+        """
+        return cls(
+            app,
+            config.protocol,
+            config.sender_comp_id,
+            config.target_comp_id,
+            config.store,
+            config.logon_timeout,
+            config.heartbeat_timeout,
+            cancellation_event,
+            heartbeat_threshold=config.heartbeat_threshold,
+            bypass_parsing=config.bypass_parsing,
+            save_interval=config.save_interval,
+            log_heartbeats=config.log_heartbeats,
+            validate=validate
+        )
 
     @property
     def session(self) -> Session:
@@ -89,22 +183,6 @@ class InitiatorEngine(AbstractInitiatorEngine):
     def heartbeat_threshold(self) -> int:
         return self._heartbeat_threshold
 
-    async def _next_outgoing_seqnum(self) -> int:
-        seqnum = await self._session.get_outgoing_seqnum()
-        seqnum += 1
-        await self._session.set_outgoing_seqnum(seqnum)
-        return seqnum
-
-    async def _send_transport_message(
-            self,
-            transport_message: TransportMessage,
-            send_time_utc: datetime
-    ) -> None:
-        if self._send is None:
-            raise ValueError('Not connected')
-        await self._send(transport_message)
-        self._last_send_time_utc = send_time_utc
-
     async def _handle_error(
             self,
             transport_message: TransportMessage
@@ -112,17 +190,16 @@ class InitiatorEngine(AbstractInitiatorEngine):
         LOGGER.warning('error: %s', transport_message)
 
     async def _send_heartbeat_if_required(self) -> None:
-        if self._transport_state_machine.state != TransportState.CONNECTED:
+        if self._transport_state_machine.state is not TransportState.CONNECTED:
             self._timeout = self.logon_timeout
             return
 
-        now_utc = self._time_provider.now(timezone.utc)
         seconds_since_last_send = (
-            now_utc - self._last_send_time_utc
-        ).total_seconds()
+            self._time_provider.monotonic() - self._last_send_time
+        )
         if (
                 seconds_since_last_send >= self._heartbeat_timeout and
-                self._admin_state_machine.state == AdminState.AUTHENTICATED
+                self._admin_state_machine.state is AdminState.AUTHENTICATED
         ):
             await self.send_message('HEARTBEAT')
             seconds_since_last_send = 0
@@ -131,17 +208,20 @@ class InitiatorEngine(AbstractInitiatorEngine):
 
     async def _next_message(
             self,
-            receive: Receive
+            receive: Receive,
+            receive_nowait: Optional[ReceiveNowait]
     ) -> TransportMessage:
         try:
             await self._send_heartbeat_if_required()
-            message = await asyncio.wait_for(
-                receive(),
-                timeout=self._timeout
-            )
+            # A message that has already arrived needs no timer.
+            if receive_nowait is not None:
+                message = receive_nowait()
+                if message is not None:
+                    return message
+            message = await wait_with_timeout(receive(), self._timeout)
             return message
         except asyncio.TimeoutError:
-            return TransportMessage(TransportEvent.TIMEOUT_RECEIVED)
+            return _TIMEOUT_RECEIVED
 
     async def __call__(
             self,
@@ -149,20 +229,57 @@ class InitiatorEngine(AbstractInitiatorEngine):
             receive: Receive
     ) -> None:
         self._send, self._receive = send, receive
+        # Transports may offer a way to take messages that are already queued.
+        receive_nowait: Optional[ReceiveNowait] = getattr(
+            receive,
+            'nowait',
+            None
+        )
+        self._run_task = asyncio.current_task()
 
-        while True:
-            message = await self._next_message(receive)
-            await self._transport_state_machine.process(message)
-            if self._transport_state_machine.state != TransportState.CONNECTED:
-                break
+        try:
+            while True:
+                message = await self._next_message(receive, receive_nowait)
+                await self._transport_state_machine.process(message)
+                if receive_nowait is not None:
+                    await self._process_received(receive_nowait)
+                if self._transport_state_machine.state is not TransportState.CONNECTED:
+                    break
+        finally:
+            # Save any queued messages, even when the engine is cancelled.
+            await self._transport_state_machine.flush()
 
         LOGGER.info('disconnected')
 
-        self._stop_event.set()
+    async def _process_received(self, receive_nowait: ReceiveNowait) -> None:
+        # Handle messages that have already arrived without the heartbeat
+        # check and the receive timeout.
+        for _ in range(_MAX_BATCH_SIZE - 1):
+            if self._transport_state_machine.state is not TransportState.CONNECTED:
+                return
+            message = receive_nowait()
+            if message is None:
+                return
+            await self._transport_state_machine.process(message)
 
     async def wait_stopped(self) -> None:
-        """Wait for the engine to be stopped"""
-        await self._stop_event.wait()
+        """Wait for the engine to be stopped.
+
+        Returns immediately if the engine was never started. An error that
+        stopped the engine is logged rather than raised.
+        """
+        task = self._run_task
+        if task is None:
+            return
+        try:
+            # Shield the engine task, so cancelling the waiter does not
+            # cancel the engine.
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('The initiator stopped with an error')
 
     async def send_message(
             self,
@@ -176,23 +293,28 @@ class InitiatorEngine(AbstractInitiatorEngine):
             message (Optional[Mapping[str, Any]], optional): The message.
                 Defaults to None.
         """
-        send_time_utc = self._time_provider.now(timezone.utc)
-        msg_seq_num = await self._next_outgoing_seqnum()
-        fix_message = self._fix_message_factory.create(
-            msg_type,
-            msg_seq_num,
-            send_time_utc,
-            message
-        )
-        LOGGER.info('Sending %s', fix_message.message)
-
-        buffer = fix_message.encode(regenerate_integrity=True)
-        transport_message = TransportMessage(
-            TransportEvent.FIX_RECEIVED,
-            buffer
-        )
-
-        await self._send_transport_message(transport_message, send_time_utc)
+        send_time_utc = self._time_provider.now(_UTC)
+        msg_seq_num = await self._session.increment_outgoing_seqnum()
+        if msg_type == 'HEARTBEAT' and message is None:
+            buffer = self._heartbeat_template.encode(msg_seq_num, send_time_utc)
+            if self._log_heartbeats and LOGGER.isEnabledFor(logging.INFO):
+                LOGGER.info('Sending %s', RawFixMessage(buffer))
+        else:
+            fix_message = self._fix_message_factory.create(
+                msg_type,
+                msg_seq_num,
+                send_time_utc,
+                message
+            )
+            if (
+                    (self._log_heartbeats or msg_type != 'HEARTBEAT') and
+                    LOGGER.isEnabledFor(logging.INFO)
+            ):
+                LOGGER.info('Sending %s', fix_message.message)
+            buffer = fix_message.encode(regenerate_integrity=True)
+
+        await self._send(buffer)
+        self._last_send_time = self._time_provider.monotonic()
 
     async def logout(self) -> None:
         """Send a logout message.
@@ -9,6 +9,7 @@ from ..admin import (
     AdminMessage,
     AdminState,
     AdminStateProcessor,
+    reject_missing_field,
 )
 from ..types import FIXApplication
 
@@ -17,10 +18,30 @@ from .types import AbstractInitiatorEngine
 
 LOGGER = logging.getLogger(__name__)
 
+# The events returned by the handlers carry no message, so each is built once
+# and reused.
+_LOGON_SENT = AdminMessage(AdminEvent.LOGON_SENT)
+_HEARTBEAT_ACKNOWLEDGED = AdminMessage(AdminEvent.HEARTBEAT_ACKNOWLEDGED)
+_TEST_REQUEST_SENT = AdminMessage(AdminEvent.TEST_REQUEST_SENT)
+_SEQUENCE_RESET_SENT = AdminMessage(AdminEvent.SEQUENCE_RESET_SENT)
+_INCOMING_SEQNUM_SET = AdminMessage(AdminEvent.INCOMING_SEQNUM_SET)
+_LOGOUT_ACKNOWLEDGED = AdminMessage(AdminEvent.LOGOUT_ACKNOWLEDGED)
+_TEST_HEARTBEAT_SENT = AdminMessage(AdminEvent.TEST_HEARTBEAT_SENT)
+_TEST_HEARTBEAT_VALID = AdminMessage(AdminEvent.TEST_HEARTBEAT_VALID)
+_TEST_HEARTBEAT_INVALID = AdminMessage(AdminEvent.TEST_HEARTBEAT_INVALID)
+
 
 class InitiatorAdminStateMachine(AdminStateProcessor):
     """The admin state machine for an initiator"""
 
+    __slots__ = (
+        '_engine',
+        '_app',
+        '_test_heartbeat_message',
+        '_test_heartbeat_prefix',
+        '_test_heartbeat_count'
+    )
+
     def __init__(
             self,
             engine: AbstractInitiatorEngine,
@@ -51,6 +72,10 @@ class InitiatorAdminStateMachine(AdminStateProcessor):
         self._engine = engine
         self._app = app
         self._test_heartbeat_message: Optional[str] = None
+        # A TestReqID only has to be unique within the session, so a random
+        # prefix is made once and followed by a counter.
+        self._test_heartbeat_prefix = uuid.uuid4().hex
+        self._test_heartbeat_count = 0
 
     async def _send_logon(
             self,
@@ -64,7 +89,7 @@ class InitiatorAdminStateMachine(AdminStateProcessor):
                 'HeartBtInt': self._engine.heartbeat_timeout
             }
         )
-        return AdminMessage(AdminEvent.LOGON_SENT)
+        return _LOGON_SENT
 
     async def _logon_received(
             self,
@@ -78,22 +103,30 @@ class InitiatorAdminStateMachine(AdminStateProcessor):
             admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
         await self._app.on_heartbeat(admin_message.fix, self._engine)
-        return AdminMessage(AdminEvent.HEARTBEAT_ACKNOWLEDGED)
+        return _HEARTBEAT_ACKNOWLEDGED
 
     async def _send_test_request(
             self,
             admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
-        assert 'TestReqID' in admin_message.fix, "expected TestReqID"
+        test_req_id = admin_message.fix.get('TestReqID')
+        if test_req_id is None:
+            # The reject answers the request.
+            await reject_missing_field(
+                self._engine,
+                admin_message.fix,
+                'TestReqID'
+            )
+            return _TEST_REQUEST_SENT
 
         # Respond to the server with the token it sent.
         await self._engine.send_message(
             'TEST_REQUEST',
             {
-                'TestReqID': admin_message.fix['TestReqID']
+                'TestReqID': test_req_id
             }
         )
-        return AdminMessage(AdminEvent.TEST_REQUEST_SENT)
+        return _TEST_REQUEST_SENT
 
     async def _send_sequence_reset(
             self,
@@ -107,30 +140,40 @@ class InitiatorAdminStateMachine(AdminStateProcessor):
                 'NewSeqNo': new_seq_no
             }
         )
-        return AdminMessage(AdminEvent.SEQUENCE_RESET_SENT)
+        return _SEQUENCE_RESET_SENT
 
     async def _reset_incoming_seqnum(
             self,
             admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
-        assert 'NewSeqNo' in admin_message.fix, "expected NewSeqNo"
-        seqnum = admin_message.fix['NewSeqNo']
+        seqnum = admin_message.fix.get('NewSeqNo')
+        if seqnum is None:
+            # The incoming seqnum is left as it was.
+            await reject_missing_field(
+                self._engine,
+                admin_message.fix,
+                'NewSeqNo'
+            )
+            return _INCOMING_SEQNUM_SET
+
         await self._engine.session.set_incoming_seqnum(seqnum)
-        return AdminMessage(AdminEvent.SEQUENCE_RESET_SENT)
+        return _INCOMING_SEQNUM_SET
 
     async def _acknowledge_logout(
             self,
             admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
-        assert admin_message.fix is not None
         await self._app.on_logout(admin_message.fix, self._engine)
-        return AdminMessage(AdminEvent.LOGOUT_ACKNOWLEDGED)
+        return _LOGOUT_ACKNOWLEDGED
 
     async def _send_test_heartbeat(
             self,
             _admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
-        self._test_heartbeat_message = str(uuid.uuid4())
+        self._test_heartbeat_count += 1
+        self._test_heartbeat_message = (
+            f'{self._test_heartbeat_prefix}-{self._test_heartbeat_count}'
+        )
 
         await self._engine.send_message(
             'TEST_REQUEST',
@@ -138,14 +181,13 @@ class InitiatorAdminStateMachine(AdminStateProcessor):
                 'TestReqID': self._test_heartbeat_message
             }
         )
-        return AdminMessage(AdminEvent.TEST_HEARTBEAT_SENT)
+        return _TEST_HEARTBEAT_SENT
 
     async def _validate_test_heartbeat(
             self,
             admin_message: AdminMessage
     ) -> Optional[AdminMessage]:
-        assert 'TestReqID' in admin_message.fix
-        if admin_message.fix['TestReqID'] == self._test_heartbeat_message:
-            return AdminMessage(AdminEvent.TEST_HEARTBEAT_VALID)
+        if admin_message.fix.get('TestReqID') == self._test_heartbeat_message:
+            return _TEST_HEARTBEAT_VALID
         else:
-            return AdminMessage(AdminEvent.TEST_HEARTBEAT_INVALID)
+            return _TEST_HEARTBEAT_INVALID
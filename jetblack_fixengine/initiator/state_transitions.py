@@ -1,5 +1,6 @@
 """Admin state transitions"""
 
+from types import MappingProxyType
 from typing import Mapping
 
 from ..admin import (
@@ -8,7 +9,7 @@ from ..admin import (
 )
 
 
-INITIATOR_ADMIN_TRANSITIONS: Mapping[AdminState, Mapping[AdminEvent, AdminState]] = {
+_TRANSITIONS: Mapping[AdminState, Mapping[AdminEvent, AdminState]] = {
     AdminState.DISCONNECTED: {
         AdminEvent.CONNECTED: AdminState.LOGON_REQUESTED
     },
@@ -50,3 +51,10 @@ INITIATOR_ADMIN_TRANSITIONS: Mapping[AdminState, Mapping[AdminEvent, AdminState]
         AdminEvent.TEST_HEARTBEAT_INVALID: AdminState.REJECT_LOGON
     }
 }
+
+# The table is a module constant shared by all initiators. Wrapping it in
+# proxies stops it being changed by accident.
+INITIATOR_ADMIN_TRANSITIONS: Mapping[AdminState, Mapping[AdminEvent, AdminState]] = MappingProxyType({
+    state: MappingProxyType(transitions)
+    for state, transitions in _TRANSITIONS.items()
+})
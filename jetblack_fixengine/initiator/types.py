@@ -1,6 +1,5 @@
 """Types"""
 
-from abc import ABCMeta
 from ssl import SSLContext
 from typing import Optional
 
@@ -9,13 +8,35 @@ from jetblack_fixparser.meta_data import ProtocolMetaData
 from ..types import FIXEngine, Store
 
 
-class AbstractInitiatorEngine(FIXEngine, metaclass=ABCMeta):
+class AbstractInitiatorEngine(FIXEngine):
     """The interface for an initiator"""
 
+    __slots__ = ()
+
 
 class InitiatorConfig:
     """The initiator configuration"""
 
+    __slots__ = (
+        'host',
+        'port',
+        'protocol',
+        'sender_comp_id',
+        'target_comp_id',
+        'store',
+        'logon_timeout',
+        'heartbeat_timeout',
+        'ssl',
+        'shutdown_timeout',
+        'heartbeat_threshold',
+        'bypass_parsing',
+        'save_interval',
+        'log_heartbeats',
+        'tcp_nodelay',
+        'send_buffer_size',
+        'receive_buffer_size'
+    )
+
     def __init__(
             self,
             host: str,
@@ -29,7 +50,13 @@ class InitiatorConfig:
             logon_timeout: int = 60,
             heartbeat_timeout: int = 30,
             shutdown_timeout: float = 10.0,
-            heartbeat_threshold: int = 1
+            heartbeat_threshold: int = 1,
+            bypass_parsing: bool = False,
+            save_interval: Optional[float] = None,
+            log_heartbeats: bool = False,
+            tcp_nodelay: bool = True,
+            send_buffer_size: Optional[int] = None,
+            receive_buffer_size: Optional[int] = None
     ) -> None:
         self.host = host
         self.port = port
@@ -42,3 +69,9 @@ class InitiatorConfig:
         self.ssl = ssl
         self.shutdown_timeout = shutdown_timeout
         self.heartbeat_threshold = heartbeat_threshold
+        self.bypass_parsing = bypass_parsing
+        self.save_interval = save_interval
+        self.log_heartbeats = log_heartbeats
+        self.tcp_nodelay = tcp_nodelay
+        self.send_buffer_size = send_buffer_size
+        self.receive_buffer_size = receive_buffer_size
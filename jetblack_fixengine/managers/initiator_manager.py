@@ -9,7 +9,7 @@ from typing import Callable, Optional, Tuple
 
 from jetblack_fixparser.meta_data import ProtocolMetaData
 
-from ..initiator import InitiatorEngine, initiate
+from ..initiator import InitiatorConfig, InitiatorEngine, initiate
 from ..types import Store, FIXApplication
 from ..utils.date_utils import wait_for_day_of_week, wait_for_time_period
 from ..utils.cancellation import register_cancellation_event
@@ -68,6 +68,18 @@ class InitiatorManager:
         return None
 
     async def start(self, shutdown_timeout: float = 10.0) -> None:
+        # One task waits for cancellation across every session.
+        cancellation_task = asyncio.create_task(self.cancellation_event.wait())
+        try:
+            await self._run_sessions(shutdown_timeout, cancellation_task)
+        finally:
+            cancellation_task.cancel()
+
+    async def _run_sessions(
+            self,
+            shutdown_timeout: float,
+            cancellation_task: 'asyncio.Task[bool]'
+    ) -> None:
         while not self.cancellation_event.is_set():
             try:
                 # Wait for the session to start.
@@ -99,17 +111,13 @@ class InitiatorManager:
                 # After logout we should disconnect.
                 await handler.logout()
 
-                try:
-                    await asyncio.wait(
-                        [
-                            handler.wait_stopped(),
-                            self.cancellation_event.wait()
-                        ],
-                        timeout=10,
-                        return_when=asyncio.FIRST_COMPLETED
-                    )
-                except asyncio.TimeoutError:
-                    pass
+                stopped_task = asyncio.create_task(handler.wait_stopped())
+                await asyncio.wait(
+                    [stopped_task, cancellation_task],
+                    timeout=10,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                stopped_task.cancel()
 
 
 def start_initiator_manager(
@@ -132,19 +140,22 @@ def start_initiator_manager(
         tz: Optional[tzinfo] = None
 ) -> None:
     cancellation_event = asyncio.Event()
+    config = InitiatorConfig(
+        host,
+        port,
+        protocol,
+        sender_comp_id,
+        target_comp_id,
+        store,
+        ssl=ssl,
+        logon_timeout=logon_timeout,
+        heartbeat_timeout=heartbeat_timeout,
+        shutdown_timeout=shutdown_timeout,
+        heartbeat_threshold=heartbeat_threshold
+    )
 
     def initiator_factory() -> InitiatorEngine:
-        return InitiatorEngine(
-            app,
-            protocol,
-            sender_comp_id,
-            target_comp_id,
-            store,
-            logon_timeout,
-            heartbeat_timeout,
-            cancellation_event,
-            heartbeat_threshold=heartbeat_threshold
-        )
+        return InitiatorEngine.from_config(app, config, cancellation_event)
 
     manager = InitiatorManager(
         initiator_factory,
@@ -158,4 +169,7 @@ def start_initiator_manager(
 
     loop = asyncio.get_event_loop()
     register_cancellation_event(cancellation_event, loop)
-    loop.run_until_complete(manager.start(shutdown_timeout))
+    try:
+        loop.run_until_complete(manager.start(shutdown_timeout))
+    finally:
+        loop.run_until_complete(store.aclose())
@@ -1,16 +1,68 @@
 """File storage"""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
 from pathlib import Path
-from typing import Literal, MutableMapping, Tuple, Union
+from typing import (
+    Callable,
+    Literal,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union
+)
 from urllib.parse import quote_from_bytes
 
-import aiofiles
 from jetblack_fixparser.fix_message import SOH
 
 from ..types import Session, Store
 
 MessageStyle = Literal['text', 'urlencode', 'hex']
 
+# fdatasync is not available on every platform.
+_datasync = getattr(os, 'fdatasync', os.fsync)
+
+
+def _close_files(*fds: int) -> None:
+    for fd in fds:
+        os.close(fd)
+
+
+def _encode_text(buf: bytes) -> bytes:
+    return buf.replace(SOH, b'|') + b'\n'
+
+
+# The bytes quote_from_bytes leaves alone, and the few others that FIX
+# messages commonly contain.
+_URL_SAFE = (
+    b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~/'
+)
+_URL_COMMON = _URL_SAFE + SOH + b'=:'
+
+
+def _encode_urlencode(buf: bytes) -> bytes:
+    if buf.translate(None, _URL_COMMON):
+        return quote_from_bytes(buf).encode() + b'\n'
+    return (
+        buf
+        .replace(b'=', b'%3D')
+        .replace(SOH, b'%01')
+        .replace(b':', b'%3A')
+    ) + b'\n'
+
+
+def _encode_hex(buf: bytes) -> bytes:
+    return buf.hex().encode()
+
+
+_MESSAGE_ENCODERS: Mapping[str, Callable[[bytes], bytes]] = {
+    'text': _encode_text,
+    'urlencode': _encode_urlencode,
+    'hex': _encode_hex,
+}
+
 
 class FileSession(Session):
     """A session using files for persistence"""
@@ -18,10 +70,20 @@ class FileSession(Session):
     def __init__(
             self,
             folder: Path,
+            executor: ThreadPoolExecutor,
             sender_comp_id: str,
             target_comp_id: str,
-            message_style: MessageStyle
+            message_style: MessageStyle,
+            save_interval: Optional[float] = None,
+            sync_every: Optional[int] = None
     ) -> None:
+        try:
+            self._encode_message = _MESSAGE_ENCODERS[message_style]
+        except KeyError as error:
+            raise ValueError(
+                f'invalid message style "{message_style}"'
+            ) from error
+
         # The file for the sequence numbers.
         self.seqnum_path = (
             folder / f'{sender_comp_id}-{target_comp_id}-initiator-seqnum.txt'
@@ -42,17 +104,89 @@ class FileSession(Session):
         self._target_comp_id = target_comp_id
         self._outgoing_seqnum = int(outgoing_seqnum)
         self._incoming_seqnum = int(incoming_seqnum)
+        # The file is kept open so a save is a single write.
+        self._seqnum_fd = os.open(
+            self.seqnum_path,
+            os.O_RDWR | getattr(os, 'O_BINARY', 0)
+        )
+        self._seqnum_length = os.fstat(self._seqnum_fd).st_size
+        self._save_interval = save_interval
+        self._save_task: Optional[asyncio.Task] = None
+        self._sync_every = sync_every
+        self._unsynced = 0
+        # Syncing can block for a while, so it is done on the store's worker.
+        self._executor = executor
 
         # The file for the messages
         self.message_path = (
             folder / f'{sender_comp_id}-{target_comp_id}-initiator-message.txt'
         )
         self.message_style = message_style
+        self._message_fd = os.open(
+            self.message_path,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0),
+            0o644
+        )
 
     async def _save(self) -> None:
-        async with aiofiles.open(self.seqnum_path, 'wt') as file_ptr:
-            await file_ptr.write(
-                f'{self._outgoing_seqnum}:{self._incoming_seqnum}\n'
+        if self._save_interval is None:
+            await self._write_seqnums()
+        elif self._save_task is None:
+            self._save_task = asyncio.create_task(self._save_later())
+
+    async def _save_later(self) -> None:
+        assert self._save_interval is not None
+        # Updates made while sleeping are written together.
+        await asyncio.sleep(self._save_interval)
+        self._save_task = None
+        await self._write_seqnums()
+
+    async def _write_seqnums(self) -> None:
+        buf = b'%d:%d\n' % (self._outgoing_seqnum, self._incoming_seqnum)
+        os.lseek(self._seqnum_fd, 0, os.SEEK_SET)
+        os.write(self._seqnum_fd, buf)
+        # Seqnums mostly grow, so the file only needs truncating when the
+        # line gets shorter.
+        if len(buf) < self._seqnum_length:
+            os.ftruncate(self._seqnum_fd, len(buf))
+        self._seqnum_length = len(buf)
+        if self._sync_every is not None:
+            self._unsynced += 1
+            if self._unsynced >= self._sync_every:
+                await self._sync()
+
+    async def _sync(self) -> None:
+        self._unsynced = 0
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            self._sync_files
+        )
+
+    def _sync_files(self) -> None:
+        _datasync(self._seqnum_fd)
+        _datasync(self._message_fd)
+
+    async def flush(self) -> None:
+        """Write any pending sequence numbers to the file."""
+        if self._save_task is not None:
+            self._save_task.cancel()
+            self._save_task = None
+            await self._write_seqnums()
+
+    async def aclose(self) -> None:
+        """Flush and close the sequence number and message files."""
+        if self._seqnum_fd != -1:
+            await self.flush()
+            if self._unsynced:
+                await self._sync()
+            fds = self._seqnum_fd, self._message_fd
+            self._seqnum_fd = self._message_fd = -1
+            # The files are closed on the worker, after any sync already
+            # queued for them.
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                _close_files,
+                *fds
             )
 
     @property
@@ -77,6 +211,11 @@ class FileSession(Session):
         self._outgoing_seqnum = seqnum
         await self._save()
 
+    async def increment_outgoing_seqnum(self) -> int:
+        self._outgoing_seqnum += 1
+        await self._save()
+        return self._outgoing_seqnum
+
     async def get_incoming_seqnum(self) -> int:
         return self._incoming_seqnum
 
@@ -85,19 +224,8 @@ class FileSession(Session):
         await self._save()
 
     async def save_message(self, buf: bytes) -> None:
-
-        async with aiofiles.open(self.message_path, 'at') as file_ptr:
-            if self.message_style == 'text':
-                await file_ptr.write(buf.replace(SOH, b'|').decode() + '\n')
-            elif self.message_style == 'urlencode':
-                await file_ptr.write(quote_from_bytes(buf) + '\n')
-            elif self.message_style == 'hex':
-                await file_ptr.write(buf.hex())
-            else:
-                raise ValueError(
-                    'invalid message style "{self.message_style}"'
-                )
-            await file_ptr.flush()
+        # An append is a single write to the page cache, like the seqnums.
+        os.write(self._message_fd, self._encode_message(buf))
 
 
 class FileStore(Store):
@@ -107,7 +235,9 @@ class FileStore(Store):
             self,
             folder: Union[str, Path],
             *,
-            message_style: MessageStyle = 'text'
+            message_style: MessageStyle = 'text',
+            save_interval: Optional[float] = None,
+            sync_every: Optional[int] = None
     ) -> None:
         if not isinstance(folder, Path):
             folder = Path(folder)
@@ -118,20 +248,41 @@ class FileStore(Store):
             raise RuntimeError(f'not a directory "{folder}"')
 
         self.folder = folder
-        self._sessions: MutableMapping[str, FileSession] = dict()
+        self._sessions: MutableMapping[Tuple[str, str], FileSession] = dict()
         self.message_style: MessageStyle = message_style
+        # If set, seqnum updates are written at most once per interval.
+        self.save_interval = save_interval
+        # If set, the files are synced to disk after this many seqnum writes.
+        self.sync_every = sync_every
+        # The sessions sync their files on a single worker thread, one at a
+        # time. The thread is only started by the first sync.
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='FileStore'
+        )
+
+    async def aclose(self) -> None:
+        """Flush and close the files of every session."""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            await session.aclose()
+        self._executor.shutdown()
 
     def get_session(self, sender_comp_id: str, target_comp_id: str) -> Session:
-        key = sender_comp_id + '\x01' + target_comp_id
+        key = (sender_comp_id, target_comp_id)
 
         if key in self._sessions:
             return self._sessions[key]
 
         session = FileSession(
             self.folder,
+            self._executor,
             sender_comp_id,
             target_comp_id,
-            self.message_style
+            self.message_style,
+            self.save_interval,
+            self.sync_every
         )
         self._sessions[key] = session
         return session
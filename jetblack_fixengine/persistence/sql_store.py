@@ -1,9 +1,9 @@
 """A sqlite3 store"""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import sqlite3
-from typing import Any, List, Mapping, MutableMapping, Tuple
-
-import aiosqlite
+from typing import Any, List, Mapping, MutableMapping, Optional, Set, Tuple
 
 from ..types import Session, Store
 
@@ -70,31 +70,75 @@ class SqlSession(Session):
 
     def __init__(
             self,
-            conn_args: List[Any],
-            conn_kwargs: Mapping[str, Any],
+            conn: sqlite3.Connection,
+            executor: ThreadPoolExecutor,
             sender_comp_id: str,
-            target_comp_id: str
+            target_comp_id: str,
+            defer_outgoing_seqnum: bool = False
     ) -> None:
-        self.conn_args = conn_args
-        self.conn_kwargs = conn_kwargs
-
-        conn = sqlite3.connect(*self.conn_args, **self.conn_kwargs)
-        cursor = conn.cursor()
-
-        cursor.execute(SEQNUM_QUERY, (sender_comp_id, target_comp_id))
-        result = cursor.fetchone()
-        if result:
-            self._outgoing_seqnum, self._incoming_seqnum = result
-        else:
-            cursor.execute(
+        self._conn = conn
+        self._executor = executor
+        self._sender_comp_id = sender_comp_id
+        self._target_comp_id = target_comp_id
+        self._defer_outgoing_seqnum = defer_outgoing_seqnum
+        # The deferred outgoing seqnum writes still running, and the first
+        # error raised by one, which is reported by flush().
+        self._pending: Set[asyncio.Future] = set()
+        self._deferred_error: Optional[BaseException] = None
+        # The connection may be writing for another session, so the seqnums
+        # are read on its thread too.
+        self._outgoing_seqnum, self._incoming_seqnum = self._executor.submit(
+            self._load
+        ).result()
+
+    def _load(self) -> Tuple[int, int]:
+        with self._conn:
+            cursor = self._conn.execute(
+                SEQNUM_QUERY,
+                (self._sender_comp_id, self._target_comp_id)
+            )
+            result = cursor.fetchone()
+            if result:
+                return result
+            self._conn.execute(
                 SEQNUM_INSERT,
-                (sender_comp_id, target_comp_id, 0, 0)
+                (self._sender_comp_id, self._target_comp_id, 0, 0)
             )
-            conn.commit()
-            self._outgoing_seqnum, self._incoming_seqnum = 0, 0
+            return 0, 0
+
+    def _execute(self, *statements: Tuple[str, Tuple[Any, ...]]) -> None:
+        # The statements are committed together, or rolled back on error.
+        with self._conn:
+            for sql, params in statements:
+                self._conn.execute(sql, params)
+
+    async def _write(self, *statements: Tuple[str, Tuple[Any, ...]]) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            self._execute,
+            *statements
+        )
 
-        self._sender_comp_id = sender_comp_id
-        self._target_comp_id = target_comp_id
+    def _deferred_write_done(self, future: asyncio.Future) -> None:
+        self._pending.discard(future)
+        if future.cancelled():
+            return
+        # Reading the exception also stops asyncio reporting it as unhandled.
+        error = future.exception()
+        if error is not None and self._deferred_error is None:
+            self._deferred_error = error
+
+    async def flush(self) -> None:
+        """Wait for the deferred outgoing seqnum writes to complete.
+
+        Raises:
+            Exception: The first error raised by a deferred write.
+        """
+        if self._pending:
+            await asyncio.wait(set(self._pending))
+        if self._deferred_error is not None:
+            error, self._deferred_error = self._deferred_error, None
+            raise error
 
     @property
     def sender_comp_id(self) -> str:
@@ -109,25 +153,42 @@ class SqlSession(Session):
 
     async def set_seqnums(self, outgoing_seqnum: int, incoming_seqnum: int) -> None:
         self._outgoing_seqnum, self._incoming_seqnum = outgoing_seqnum, incoming_seqnum
-        async with aiosqlite.connect(*self.conn_args, **self.conn_kwargs) as db:
-            await db.execute(
-                SEQNUM_UPDATE,
-                (
-                    self._outgoing_seqnum,
-                    self._incoming_seqnum,
-                    self.sender_comp_id,
-                    self.target_comp_id
-                )
+        await self._write((
+            SEQNUM_UPDATE,
+            (
+                self._outgoing_seqnum,
+                self._incoming_seqnum,
+                self.sender_comp_id,
+                self.target_comp_id
             )
-            await db.commit()
+        ))
 
     async def get_outgoing_seqnum(self) -> int:
         return self._outgoing_seqnum
 
     async def set_outgoing_seqnum(self, seqnum: int) -> None:
         self._outgoing_seqnum = seqnum
-        async with aiosqlite.connect(*self.conn_args, **self.conn_kwargs) as db:
-            await db.execute(
+        await self._write((
+            SEQNUM_UPDATE_OUTGOING,
+            (
+                self._outgoing_seqnum,
+                self.sender_comp_id,
+                self.target_comp_id
+            )
+        ))
+
+    async def increment_outgoing_seqnum(self) -> int:
+        if not self._defer_outgoing_seqnum:
+            await self.set_outgoing_seqnum(self._outgoing_seqnum + 1)
+            return self._outgoing_seqnum
+
+        # The executor has a single worker, so the update is still written
+        # before any statement submitted after it.
+        self._outgoing_seqnum += 1
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            self._execute,
+            (
                 SEQNUM_UPDATE_OUTGOING,
                 (
                     self._outgoing_seqnum,
@@ -135,38 +196,59 @@ class SqlSession(Session):
                     self.target_comp_id
                 )
             )
-            await db.commit()
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._deferred_write_done)
+        return self._outgoing_seqnum
 
     async def get_incoming_seqnum(self) -> int:
         return self._incoming_seqnum
 
     async def set_incoming_seqnum(self, seqnum: int) -> None:
         self._incoming_seqnum = seqnum
-        async with aiosqlite.connect(*self.conn_args, **self.conn_kwargs) as db:
-            await db.execute(
+        await self._write((
+            SEQNUM_UPDATE_INCOMING,
+            (
+                self._incoming_seqnum,
+                self.sender_comp_id,
+                self.target_comp_id
+            )
+        ))
+
+    async def save_message(self, buf: bytes) -> None:
+        await self._write((
+            MESSAGE_INSERT,
+            (
+                self.sender_comp_id,
+                self.target_comp_id,
+                self._outgoing_seqnum,
+                self._incoming_seqnum,
+                buf.decode('ascii')
+            )
+        ))
+
+    async def save_and_advance(self, buf: bytes, incoming_seqnum: int) -> None:
+        self._incoming_seqnum = incoming_seqnum
+        await self._write(
+            (
                 SEQNUM_UPDATE_INCOMING,
                 (
                     self._incoming_seqnum,
                     self.sender_comp_id,
                     self.target_comp_id
                 )
-            )
-            await db.commit()
-
-    async def save_message(self, buf: bytes) -> None:
-        async with aiosqlite.connect(*self.conn_args, **self.conn_kwargs) as db:
-            message = buf.decode('ascii')
-            await db.execute(
+            ),
+            (
                 MESSAGE_INSERT,
                 (
                     self.sender_comp_id,
                     self.target_comp_id,
                     self._outgoing_seqnum,
                     self._incoming_seqnum,
-                    message
+                    buf.decode('ascii')
                 )
             )
-            await db.commit()
+        )
 
 
 class SqlStore(Store):
@@ -175,27 +257,59 @@ class SqlStore(Store):
     def __init__(
             self,
             conn_args: List[Any],
-            conn_kwargs: Mapping[str, Any]
+            conn_kwargs: Mapping[str, Any],
+            *,
+            defer_outgoing_seqnum: bool = False
     ) -> None:
         self.conn_args = conn_args
         self.conn_kwargs = conn_kwargs
-        conn = sqlite3.connect(*self.conn_args, **self.conn_kwargs)
-        cursor = conn.cursor()
+        # If true, sending does not wait for the outgoing seqnum to be written.
+        self.defer_outgoing_seqnum = defer_outgoing_seqnum
+
+        # The sessions share one connection, held for the life of the store.
+        # Every statement runs on a single worker thread, so the connection
+        # is never used by two threads at once.
+        self._conn = sqlite3.connect(
+            *self.conn_args,
+            **{**self.conn_kwargs, 'check_same_thread': False}
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='SqlStore'
+        )
+        self._executor.submit(self._create_tables).result()
+        self._sessions: MutableMapping[Tuple[str, str], SqlSession] = dict()
+
+    def _create_tables(self) -> None:
+        cursor = self._conn.cursor()
         cursor.execute(CREATE_SEQNUM_TABLE_SQL)
         cursor.execute(CREATE_MESSAGE_TABLE_SQL)
-        self._sessions: MutableMapping[str, SqlSession] = dict()
+        self._conn.commit()
+
+    async def aclose(self) -> None:
+        """Wait for the deferred writes, then close the database connection."""
+        try:
+            for session in self._sessions.values():
+                await session.flush()
+        finally:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                self._conn.close
+            )
+            self._executor.shutdown()
 
     def get_session(self, sender_comp_id: str, target_comp_id: str) -> Session:
-        key = sender_comp_id + '\x01' + target_comp_id
+        key = (sender_comp_id, target_comp_id)
 
         if key in self._sessions:
             return self._sessions[key]
 
         session = SqlSession(
-            self.conn_args,
-            self.conn_kwargs,
+            self._conn,
+            self._executor,
             sender_comp_id,
-            target_comp_id
+            target_comp_id,
+            self.defer_outgoing_seqnum
         )
         self._sessions[key] = session
         return session
@@ -0,0 +1,68 @@
+"""A raw FIX message"""
+
+from typing import MutableMapping, Optional
+
+from jetblack_fixparser.fix_message import SOH
+
+
+class RawFixMessage:
+    """A FIX message with fields that are found on demand.
+
+    A field is found by scanning the buffer the first time it is requested.
+    Only the first occurrence of a tag is returned, so fields in repeating
+    groups should be read from the buffer directly.
+    """
+
+    __slots__ = ('buffer', 'sep', '_fields')
+
+    def __init__(self, buffer: bytes, sep: bytes = SOH) -> None:
+        """Initialise the raw FIX message.
+
+        Args:
+            buffer (bytes): The FIX message.
+            sep (bytes, optional): The field separator. Defaults to SOH.
+        """
+        self.buffer = buffer
+        self.sep = sep
+        self._fields: MutableMapping[int, Optional[bytes]] = {}
+
+    def get(self, tag: int) -> Optional[bytes]:
+        """Get the value of a field.
+
+        Args:
+            tag (int): The field number.
+
+        Returns:
+            Optional[bytes]: The value, or None if the field is not present.
+        """
+        try:
+            return self._fields[tag]
+        except KeyError:
+            value = self._fields[tag] = self._find(tag)
+            return value
+
+    def _find(self, tag: int) -> Optional[bytes]:
+        token = b'%d=' % tag
+        if self.buffer.startswith(token):
+            start = len(token)
+        else:
+            token = self.sep + token
+            start = self.buffer.find(token)
+            if start == -1:
+                return None
+            start += len(token)
+
+        end = self.buffer.find(self.sep, start)
+        return self.buffer[start:end] if end != -1 else self.buffer[start:]
+
+    def __getitem__(self, tag: int) -> bytes:
+        value = self.get(tag)
+        if value is None:
+            raise KeyError(tag)
+        return value
+
+    def __contains__(self, tag: object) -> bool:
+        return isinstance(tag, int) and self.get(tag) is not None
+
+    def __str__(self) -> str:
+        return self.buffer.replace(self.sep, b'|').decode('ascii', 'replace')
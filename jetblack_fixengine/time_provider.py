@@ -2,6 +2,7 @@
 
 from abc import ABCMeta, abstractmethod
 from datetime import datetime, tzinfo
+import time
 
 
 class TimeProvider(metaclass=ABCMeta):
@@ -15,6 +16,10 @@ class TimeProvider(metaclass=ABCMeta):
     def min(self, tz: tzinfo) -> datetime:
         """The minimum time"""
 
+    def monotonic(self) -> float:
+        """A clock in seconds for measuring intervals"""
+        return time.monotonic()
+
 
 class DefaultTimeProvider(TimeProvider):
     """The default time provider"""
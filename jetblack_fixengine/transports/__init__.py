@@ -4,7 +4,7 @@ from .fix_transport import fix_stream_processor
 from .fix_read_buffer import FixReadBuffer
 from .fix_reader_async import fix_read_async
 from .state_machine import TransportStateMachine
-from .state_processor import TransportHandler, Send, Receive
+from .state_processor import TransportHandler, Send, Receive, ReceiveNowait
 from .types import TransportEvent, TransportMessage, TransportState
 
 __all__ = [
@@ -17,6 +17,7 @@ __all__ = [
     'TransportHandler',
     'Send',
     'Receive',
+    'ReceiveNowait',
 
     'TransportEvent',
     'TransportMessage',
@@ -3,9 +3,9 @@
 Implements an IO agnostic state machine to handle parsing FIX protocol messages.
 """
 
-from collections import deque
 from enum import IntEnum
-from typing import Callable, Deque, Mapping, Optional, Tuple, Union
+import re
+from typing import Callable, Mapping, Optional, Tuple
 
 from jetblack_fixparser.fix_message import SOH, calc_checksum
 
@@ -33,8 +33,7 @@ class ReadState(IntEnum):
     DONE = 0x0f
 
     IDLE = 0x10
-    EXPECT_BEGIN_STRING = 0x20
-    EXPECT_BODY_LENGTH = 0x30
+    EXPECT_HEADER = 0x20
     EXPECT_BODY = 0x40
     END_OF_FILE = 0x50
     EXPECT = 0xf0
@@ -42,9 +41,13 @@ class ReadState(IntEnum):
 
 StateResponse = Tuple[Optional[FixReadEvent], bool]
 
-TransitionKey = Tuple[ReadState, InputState]
+# The events without a payload are never mutated, so they are shared.
+_NEEDS_MORE_DATA = FixReadNeedsMoreData()
+_END_OF_FILE = FixReadEndOfFile()
+
 TransitionValue = Tuple[Callable[[], StateResponse], ReadState]
-TransitionMap = Mapping[TransitionKey, TransitionValue]
+# The transitions for each state, by input state.
+TransitionMap = Mapping[ReadState, Mapping[InputState, TransitionValue]]
 
 
 class FixReadBuffer:
@@ -62,61 +65,69 @@ class FixReadBuffer:
 
         self._sep_length = len(sep)
         self._checksum_length = len(b'10=000') + self._sep_length
-        self._queue: Deque[Union[bytes, bytearray]] = deque()
+        # All the received data that has not yet been returned as a message.
+        # The message being read always starts at the front.
         self._buf = bytearray()
+        # True when the buffer holds data the current state has not seen.
+        self._has_data = False
+        self._is_eof = False
         self._index = 0
         self._required_length = -1
+        # Matches the BeginString and BodyLength fields in one scan.
+        escaped_sep = re.escape(sep)
+        if len(sep) == 1:
+            value = b'[^' + escaped_sep + b']*'
+        else:
+            value = b'(?:(?!' + escaped_sep + b').)*'
+        self._header = re.compile(
+            b'8=' + value + escaped_sep + b'9=([0-9]+)' + escaped_sep,
+            re.DOTALL
+        )
 
         # The initial state is idle.
         self._state = ReadState.IDLE
         # These are the state transitions.
         self._transitions: TransitionMap = {
-
-            (ReadState.IDLE, InputState.EMPTY): (
-                self._request_data,
-                ReadState.IDLE
-            ),
-            (ReadState.IDLE, InputState.HAS_DATA): (
-                self._proceed_to_next_state,
-                ReadState.EXPECT_BEGIN_STRING
-            ),
-            (ReadState.IDLE, InputState.EOF): (
-                self._handle_end_of_file,
-                ReadState.END_OF_FILE
-            ),
-
-            (ReadState.EXPECT_BEGIN_STRING, InputState.EMPTY): (
-                self._request_data,
-                ReadState.EXPECT_BEGIN_STRING
-            ),
-            (ReadState.EXPECT_BEGIN_STRING, InputState.HAS_DATA): (
-                self._process_begin_string,
-                ReadState.EXPECT_BODY_LENGTH
-            ),
-
-            (ReadState.EXPECT_BODY_LENGTH, InputState.EMPTY): (
-                self._request_data,
-                ReadState.EXPECT_BODY_LENGTH
-            ),
-            (ReadState.EXPECT_BODY_LENGTH, InputState.HAS_DATA): (
-                self._process_body_length,
-                ReadState.EXPECT_BODY
-            ),
-
-            (ReadState.EXPECT_BODY, InputState.EMPTY): (
-                self._request_data,
-                ReadState.EXPECT_BODY
-            ),
-
-            (ReadState.EXPECT_BODY, InputState.HAS_DATA): (
-                self._process_body,
-                ReadState.IDLE
-            ),
-
-            (ReadState.END_OF_FILE, InputState.EOF): (
-                self._handle_end_of_file,
-                ReadState.CLOSED
-            )
+            ReadState.IDLE: {
+                InputState.EMPTY: (
+                    self._request_data,
+                    ReadState.IDLE
+                ),
+                InputState.HAS_DATA: (
+                    self._proceed_to_next_state,
+                    ReadState.EXPECT_HEADER
+                ),
+                InputState.EOF: (
+                    self._handle_end_of_file,
+                    ReadState.END_OF_FILE
+                ),
+            },
+            ReadState.EXPECT_HEADER: {
+                InputState.EMPTY: (
+                    self._request_data,
+                    ReadState.EXPECT_HEADER
+                ),
+                InputState.HAS_DATA: (
+                    self._process_header,
+                    ReadState.EXPECT_BODY
+                ),
+            },
+            ReadState.EXPECT_BODY: {
+                InputState.EMPTY: (
+                    self._request_data,
+                    ReadState.EXPECT_BODY
+                ),
+                InputState.HAS_DATA: (
+                    self._process_body,
+                    ReadState.IDLE
+                ),
+            },
+            ReadState.END_OF_FILE: {
+                InputState.EOF: (
+                    self._handle_end_of_file,
+                    ReadState.CLOSED
+                ),
+            },
         }
 
     @property
@@ -126,20 +137,26 @@ class FixReadBuffer:
         Returns:
             InputState: The state of the input
         """
-        if len(self._queue) == 0:
-            return InputState.EMPTY
-        elif not self._queue[0]:
+        if self._has_data:
+            return InputState.HAS_DATA
+        elif self._is_eof:
             return InputState.EOF
         else:
-            return InputState.HAS_DATA
+            return InputState.EMPTY
 
     def receive(self, buf: bytes):
         """Receive data.
 
+        An empty buffer marks the end of the input.
+
         Args:
             buf (bytes): The buffer to process.
         """
-        self._queue.append(buf)
+        if buf:
+            self._buf += buf
+            self._has_data = True
+        else:
+            self._is_eof = True
 
     def next_event(self) -> FixReadEvent:
         """Get the next event
@@ -151,12 +168,23 @@ class FixReadBuffer:
             FixReadEvent: The next event.
         """
 
+        # When a whole message is already buffered it is read directly,
+        # rather than stepping through the states.
+        if self._state is ReadState.IDLE and self._has_data:
+            match = self._header.match(self._buf)
+            if match is not None:
+                required_length = (
+                    match.end() + int(match.group(1)) + self._checksum_length
+                )
+                if len(self._buf) >= required_length:
+                    self._required_length = required_length
+                    return self._take_message()
+
         event: Optional[FixReadEvent] = None
 
         while self._state & ReadState.EXPECT:
             try:
-                transition = (self._state, self.input_state)
-                func, next_state = self._transitions[transition]
+                func, next_state = self._transitions[self._state][self.input_state]
             except KeyError as error:
                 raise FixReadError('Unknown transition') from error
             else:
@@ -169,76 +197,74 @@ class FixReadBuffer:
 
         raise FixReadError('Invalid state')
 
-    def _requeue_unprocessed(self) -> None:
-        if len(self._buf) > self._index:
-            self._queue.appendleft(self._buf[self._index:])
-            self._buf = self._buf[:self._index]
+    def _needs_more_data(self, length: int = -1) -> StateResponse:
+        # Everything in the buffer has been seen, so wait for new data.
+        self._has_data = False
+        if length == -1:
+            return _NEEDS_MORE_DATA, False
+        return FixReadNeedsMoreData(length), False
+
+    def _advance(self, index: int) -> StateResponse:
+        self._index = index
+        self._has_data = len(self._buf) > index
+        return None, True
 
     def _proceed_to_next_state(self) -> StateResponse:
         return None, True
 
     def _request_data(self) -> StateResponse:
-        return FixReadNeedsMoreData(), False
+        return _NEEDS_MORE_DATA, False
 
-    def _process_begin_string(self) -> StateResponse:
-        assert self._index == 0
+    def _process_header(self) -> StateResponse:
+        # The header is the BeginString and BodyLength fields, e.g.
+        # b'8=FIX.4.2\x019=129\x01'.
+        match = self._header.match(self._buf)
+        if match is None:
+            return self._check_partial_header()
 
-        self._buf += self._queue.popleft()
+        # It is within the specification for the length to be zero padded,
+        # which int accepts. The total length includes the checksum.
+        self._required_length = (
+            match.end() + int(match.group(1)) + self._checksum_length
+        )
 
+        # Advance the index and expect the body.
+        return self._advance(match.end())
+
+    def _check_partial_header(self) -> StateResponse:
         # Find the SOH field separator.
         soh_index = self._buf.find(self.sep)
         if soh_index == -1:
             # We need more data
-            return FixReadNeedsMoreData(), False
+            return self._needs_more_data()
 
         # Should start with the BeginString tag: e.g. b'8=FIX.4.2\x01'.
         if not self._buf.startswith(b'8='):
             raise FixReadError('Expected BeginString')
 
-        # Advance the index and expect body length.
-        self._index = soh_index + 1
-        self._requeue_unprocessed()
-
-        return None, True
-
-    def _process_body_length(self) -> StateResponse:
-        self._buf += self._queue.popleft()
-
-        # Find the net SOH field separator.
-        soh_index = self._buf.find(self.sep, self._index)
+        # Find the next SOH field separator.
+        index = soh_index + self._sep_length
+        soh_index = self._buf.find(self.sep, index)
         if soh_index == -1:
             # We need more data.
-            return FixReadNeedsMoreData(), False
+            return self._needs_more_data()
 
         # We expect the BodyLength tag: e.g. b'9=129\x01'.
-        if not self._buf[self._index: soh_index].startswith(b'9='):
+        if not self._buf.startswith(b'9=', index, soh_index):
             raise FixReadError('Expected BodyLength')
 
-        value = self._buf[self._index+2:soh_index]
-        # It is within the specification for the length to be zero padded.
-        if len(value) > 1 and value.startswith(b'0'):
-            value = value.lstrip(b'0')
-        body_length = int(value)
-        # The total length includes the checksum.
-        self._required_length = soh_index + self._sep_length + \
-            body_length + self._checksum_length
-
-        # Advance the index and expect the body.
-        self._index = soh_index + 1
-
-        self._requeue_unprocessed()
-
-        return None, True
+        raise FixReadError('Invalid BodyLength')
 
     def _process_body(self) -> StateResponse:
-        self._buf += self._queue.popleft()
-
         # Have we got enough data?
         if len(self._buf) < self._required_length:
             # We can supply a hint for how much data we need.
             bytes_required = self._required_length - len(self._buf)
-            return FixReadNeedsMoreData(bytes_required), False
+            return self._needs_more_data(bytes_required)
+
+        return self._take_message(), True
 
+    def _take_message(self) -> FixReadEvent:
         # We have the full message.
         data = bytes(self._buf[:self._required_length])
         if not data .endswith(self.sep):
@@ -258,14 +284,14 @@ class FixReadBuffer:
             if checksum_value != expected:
                 raise FixReadError("Wrong checksum")
 
-        # Reset state
-        if len(self._buf) > self._required_length:
-            self._queue.appendleft(self._buf[self._required_length:])
-        self._buf = bytearray()
+        # Reset state. Deleting from the front of a bytearray does not move
+        # the data that follows.
+        del self._buf[:self._required_length]
+        self._has_data = len(self._buf) > 0
         self._index = 0
         self._required_length = 0
 
-        return FixReadDataReady(data), True
+        return FixReadDataReady(data)
 
     def _handle_end_of_file(self) -> StateResponse:
-        return FixReadEndOfFile(), True
+        return _END_OF_FILE, True
@@ -1,11 +1,15 @@
 """An async fix reader"""
 
-from asyncio import StreamReader
+from asyncio import IncompleteReadError, StreamReader
 from typing import AsyncIterator, cast
 
 from ..types import InvalidStateTransitionError
 
-from .fix_events import FixReadEventType, FixReadDataReady
+from .fix_events import (
+    FixReadEventType,
+    FixReadDataReady,
+    FixReadNeedsMoreData
+)
 from .fix_read_buffer import FixReadBuffer
 
 
@@ -34,7 +38,16 @@ async def fix_read_async(
         if fix_event.event_type == FixReadEventType.EOF:
             done = True
         elif fix_event.event_type == FixReadEventType.NEEDS_MORE_DATA:
-            buf = await stream_reader.read(blksiz)
+            length = cast(FixReadNeedsMoreData, fix_event).length
+            if length > 0:
+                # The rest of the message is known, so read it in one go.
+                try:
+                    buf = await stream_reader.readexactly(length)
+                except IncompleteReadError as error:
+                    read_buffer.receive(error.partial)
+                    buf = b''
+            else:
+                buf = await stream_reader.read(blksiz)
             read_buffer.receive(buf)
         elif fix_event.event_type == FixReadEventType.DATA_READY:
             data_ready = cast(FixReadDataReady, fix_event)
@@ -4,7 +4,7 @@ import asyncio
 from asyncio import Queue, Task, StreamWriter, Future
 from enum import IntEnum
 import logging
-from typing import AsyncIterator, Set, cast
+from typing import AsyncIterator, Optional, Set, Union
 
 from jetblack_fixparser.fix_message import SOH
 
@@ -15,6 +15,27 @@ from .state_processor import TransportHandler
 LOGGER = logging.getLogger(__name__)
 
 
+class _QueueReceiver:
+    """Receives transport messages from a queue"""
+
+    __slots__ = ('_queue',)
+
+    def __init__(self, queue: 'Queue[TransportMessage]') -> None:
+        self._queue = queue
+
+    async def __call__(self) -> TransportMessage:
+        return await self._queue.get()
+
+    def nowait(self) -> Optional[TransportMessage]:
+        """Get a message that has already been received.
+
+        Returns:
+            Optional[TransportMessage]: The message, or None if the queue is
+                empty.
+        """
+        return None if self._queue.empty() else self._queue.get_nowait()
+
+
 class FixState(IntEnum):
     """The FIX state"""
     OK = 0
@@ -47,12 +68,13 @@ async def fix_stream_processor(
         return
 
     read_queue: "Queue[TransportMessage]" = Queue()
-    write_queue: "Queue[TransportMessage]" = Queue()
+    write_queue: "Queue[Union[TransportMessage, bytes]]" = Queue()
 
-    async def receive() -> TransportMessage:
-        return await read_queue.get()
+    # Handlers can also take messages that are already queued from the
+    # receiver's nowait method.
+    receive = _QueueReceiver(read_queue)
 
-    async def send(evt: TransportMessage) -> None:
+    async def send(evt: Union[TransportMessage, bytes]) -> None:
         await write_queue.put(evt)
 
     await read_queue.put(TransportMessage(TransportEvent.CONNECTION_RECEIVED))
@@ -62,12 +84,14 @@ async def fix_stream_processor(
 
     # Create initial tasks.
     handler_task: Task = asyncio.create_task(
-        handler(send, receive)  # type: ignore
+        handler(send, receive)
     )
     read_task: Task[bytes] = asyncio.create_task(
         reader_iter.__anext__()  # type: ignore
     )
-    write_task: Task[TransportMessage] = asyncio.create_task(write_queue.get())
+    write_task: Task[Union[TransportMessage, bytes]] = asyncio.create_task(
+        write_queue.get()
+    )
     cancellation_task = asyncio.create_task(cancellation_event.wait())
     pending: Set[Future] = {
         read_task,
@@ -76,7 +100,7 @@ async def fix_stream_processor(
         cancellation_task
     }
     # Start the task service loop.
-    while state == FixState.OK and not cancellation_event.is_set():
+    while state is FixState.OK and not cancellation_event.is_set():
 
         # Wait for a task to be completed.
         completed, pending = await asyncio.wait(
@@ -102,19 +126,12 @@ async def fix_stream_processor(
                 # Fetch the message sent by the handler.
                 message = write_task.result()
 
-                if message.event == TransportEvent.FIX_RECEIVED:
-                    # Send data to the handler and renew the write task.
+                if isinstance(message, bytes):
+                    data = message
+                elif message.event is TransportEvent.FIX_RECEIVED:
                     assert message.buffer is not None
                     data = message.buffer
-                    LOGGER.debug(
-                        'Sending "%s"',
-                        message.buffer.replace(SOH, b'|').decode()
-                    )
-                    writer.write(message.buffer)
-                    await writer.drain()
-                    write_task = asyncio.create_task(write_queue.get())
-                    pending.add(write_task)
-                elif message.event == TransportEvent.DISCONNECT_RECEIVED:
+                elif message.event is TransportEvent.DISCONNECT_RECEIVED:
                     # Close the connection and exit the task service loop.
                     writer.close()
                     state = FixState.HANDLER_CLOSED
@@ -123,14 +140,26 @@ async def fix_stream_processor(
                     LOGGER.debug('Invalid event "%s"', message.event.name)
                     raise RuntimeError(f'Invalid event "{message.event.name}"')
 
-            elif task == read_task:
-
-                try:
-                    data = cast(bytes, task.result())
+                # Write the data and renew the write task.
+                if LOGGER.isEnabledFor(logging.DEBUG):
                     LOGGER.debug(
-                        'Received "%s"',
+                        'Sending "%s"',
                         data.replace(SOH, b'|').decode()
                     )
+                writer.write(data)
+                await writer.drain()
+                write_task = asyncio.create_task(write_queue.get())
+                pending.add(write_task)
+
+            elif task == read_task:
+
+                try:
+                    data = read_task.result()
+                    if LOGGER.isEnabledFor(logging.DEBUG):
+                        LOGGER.debug(
+                            'Received "%s"',
+                            data.replace(SOH, b'|').decode()
+                        )
                     # Notify the client and reset the state.
                     await read_queue.put(
                         TransportMessage(
@@ -153,7 +182,7 @@ async def fix_stream_processor(
 
     # Attempt to shutdown gracefully.
 
-    if state == FixState.HANDLER_COMPLETED:
+    if state is FixState.HANDLER_COMPLETED:
         # When the handler task has finished the session if over.
         # Calling done will re-raise an exception.
         handler_task.done()
@@ -168,7 +197,7 @@ async def fix_stream_processor(
 
         await cancel_await(write_task)
 
-        if state != FixState.EOF:
+        if state is not FixState.EOF:
             writer.close()
             await cancel_await(read_task)
 
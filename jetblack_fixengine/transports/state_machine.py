@@ -1,8 +1,12 @@
 """Transport state machine"""
 
-from datetime import timezone
+import asyncio
+from collections import deque
 import logging
-from typing import Mapping, Any, Optional, cast
+from typing import Any, Deque, Dict, Iterator, Mapping, Optional
+
+from jetblack_fixparser.fix_message import FixMessageFactory
+from jetblack_fixparser.meta_data import ProtocolMetaData
 
 from ..admin import (
     AdminState,
@@ -10,6 +14,7 @@ from ..admin import (
     AdminMessage,
     AdminStateProcessor
 )
+from ..raw_fix_message import RawFixMessage
 from ..time_provider import TimeProvider
 
 from .types import (
@@ -23,16 +28,112 @@ from ..types import FIXEngine, FIXApplication
 
 LOGGER = logging.getLogger(__name__)
 
+# The handled responses carry no data and are never mutated, so a single
+# instance of each is shared.
+FIX_HANDLED = TransportMessage(TransportEvent.FIX_HANDLED)
+TIMEOUT_HANDLED = TransportMessage(TransportEvent.TIMEOUT_HANDLED)
+
+# The admin events raised by the transport carry no message either.
+_CONNECTED = AdminMessage(AdminEvent.CONNECTED)
+_TEST_HEARTBEAT_REQUIRED = AdminMessage(AdminEvent.TEST_HEARTBEAT_REQUIRED)
+
+
+def _admin_msg_types(protocol: ProtocolMetaData) -> Mapping[str, bool]:
+    """Map the decoded MsgType names to whether they are admin messages"""
+    values_by_name = protocol.fields_by_name['MsgType'].values_by_name or {}
+    return {
+        name: protocol.messages_by_type[value].msgcat == 'admin'
+        for name, value in values_by_name.items()
+        if value in protocol.messages_by_type
+    }
+
+
+def _is_overridden(app: FIXApplication, name: str) -> bool:
+    """Check if the application overrides a FIXApplication callback"""
+    return getattr(type(app), name) is not getattr(FIXApplication, name)
+
+
+def _admin_events(is_admin: Mapping[str, bool]) -> Mapping[str, AdminEvent]:
+    """Map the decoded admin MsgType names to admin events.
+
+    The decoder returns the protocol's own name strings, so keying on them
+    lets lookups match on identity.
+    """
+    admin_events: Dict[str, AdminEvent] = {}
+    for name, is_admin_msg_type in is_admin.items():
+        if is_admin_msg_type:
+            try:
+                admin_events[name] = AdminEvent.from_msg_type(name)
+            except ValueError:
+                pass
+    return admin_events
+
+
+class _LazyMessage(Mapping[str, Any]):
+    """A received message that is decoded when it is first read"""
+
+    __slots__ = ('_buffer', '_factory', '_message')
+
+    def __init__(self, buffer: bytes, factory: FixMessageFactory) -> None:
+        self._buffer = buffer
+        self._factory = factory
+        self._message: Optional[Mapping[str, Any]] = None
+
+    @property
+    def message(self) -> Mapping[str, Any]:
+        """The decoded message"""
+        if self._message is None:
+            self._message = self._factory.decode(self._buffer).message
+        return self._message
+
+    def __getitem__(self, key: str) -> Any:
+        return self.message[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.message)
+
+    def __len__(self) -> int:
+        return len(self.message)
+
+    def __str__(self) -> str:
+        return str(self.message)
+
 
 class TransportStateMachine(TransportStateProcessor):
     """A state machine for the transport layer"""
 
+    __slots__ = (
+        '_engine',
+        '_app',
+        '_admin_state_machine',
+        '_time_provider',
+        '_last_receive_time',
+        '_is_admin',
+        '_admin_events',
+        '_bypass_parsing',
+        '_admin_msgtypes',
+        '_heartbeat_token',
+        '_test_req_id_token',
+        '_save_interval',
+        '_unsaved',
+        '_save_task',
+        '_is_save_waiting',
+        '_save_error',
+        '_log_heartbeats',
+        '_has_on_admin_message',
+        '_has_on_heartbeat'
+    )
+
     def __init__(
             self,
             engine: FIXEngine,
             app: FIXApplication,
             admin_state_machine: AdminStateProcessor,
-            time_provider: TimeProvider
+            time_provider: TimeProvider,
+            *,
+            bypass_parsing: bool = False,
+            save_interval: Optional[float] = None,
+            log_heartbeats: bool = False
     ) -> None:
         super().__init__(
             {
@@ -50,31 +151,129 @@ class TransportStateMachine(TransportStateProcessor):
         self._app = app
         self._admin_state_machine = admin_state_machine
         self._time_provider = time_provider
-        self._last_receive_time_utc = self._time_provider.min(timezone.utc)
+        self._last_receive_time = float('-inf')
+        self._is_admin = _admin_msg_types(
+            engine.fix_message_factory.protocol
+        )
+        self._admin_events = _admin_events(self._is_admin)
+        self._bypass_parsing = bypass_parsing
+        self._admin_msgtypes = frozenset(
+            message.msgtype
+            for message in engine.fix_message_factory.protocol.messages_by_type.values()
+            if message.msgcat == 'admin'
+        )
+        # Heartbeats without a TestReqID are recognised without decoding.
+        sep = engine.fix_message_factory.sep
+        msg_types = engine.fix_message_factory.protocol.fields_by_name[
+            'MsgType'
+        ].values_by_name or {}
+        self._heartbeat_token = sep + b'35=' + msg_types['HEARTBEAT'] + sep
+        self._test_req_id_token = sep + b'112='
+        self._save_interval = save_interval
+        self._unsaved: Deque[bytes] = deque()
+        self._save_task: Optional[asyncio.Task] = None
+        # True while the save task waits for the interval, and can be
+        # cancelled without interrupting a save.
+        self._is_save_waiting = False
+        # The first error raised by the save task, which is reported by flush.
+        self._save_error: Optional[BaseException] = None
+        self._log_heartbeats = log_heartbeats
+        # The default callbacks do nothing, so they are only awaited when
+        # the application provides its own.
+        self._has_on_admin_message = _is_overridden(app, 'on_admin_message')
+        self._has_on_heartbeat = _is_overridden(app, 'on_heartbeat')
+
+    async def _save_received(self, buffer: bytes, msg_seq_num: int) -> None:
+        if self._save_interval is None:
+            await self._engine.session.save_and_advance(buffer, msg_seq_num)
+            return
+
+        # Only the message is saved later. The seqnum is advanced now, so an
+        # admin message handled next, like a SequenceReset, sees it and can
+        # replace it.
+        await self._engine.session.set_incoming_seqnum(msg_seq_num)
+        self._unsaved.append(buffer)
+        if self._save_task is None or self._save_task.done():
+            self._is_save_waiting = True
+            self._save_task = asyncio.create_task(self._save_later())
+            self._save_task.add_done_callback(self._save_done)
+
+    async def _save_later(self) -> None:
+        assert self._save_interval is not None
+        await asyncio.sleep(self._save_interval)
+        self._is_save_waiting = False
+        await self._save_unsaved()
+
+    def _save_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        # Reading the exception also stops asyncio reporting it as unhandled.
+        error = task.exception()
+        if error is not None and self._save_error is None:
+            self._save_error = error
+
+    async def _save_unsaved(self) -> None:
+        # A message stays queued until it has been saved, so one that fails
+        # is tried again by the next save.
+        while self._unsaved:
+            await self._engine.session.save_message(self._unsaved[0])
+            self._unsaved.popleft()
+
+    async def flush(self) -> None:
+        """Save any received messages that are waiting to be saved
+
+        Raises:
+            Exception: The first error raised while saving in the background.
+        """
+        task, self._save_task = self._save_task, None
+        if task is not None:
+            if self._is_save_waiting:
+                task.cancel()
+            # Only one save runs at a time, so wait for the task to finish.
+            await asyncio.wait([task])
+        await self._save_unsaved()
+        if self._save_error is not None:
+            error, self._save_error = self._save_error, None
+            raise error
 
     async def _handle_connected(
             self,
             _transport_message: TransportMessage
     ) -> Optional[TransportMessage]:
         LOGGER.info('connected')
-        await self._admin_state_machine.process(
-            AdminMessage(AdminEvent.CONNECTED)
-        )
+        await self._admin_state_machine.process(_CONNECTED)
         return None
 
     async def _handle_fix(
             self,
             transport_message: TransportMessage
     ) -> Optional[TransportMessage]:
-        await self._engine.session.save_message(transport_message.buffer)
+        buffer = transport_message.buffer
+        if (
+                self._heartbeat_token in buffer and
+                self._test_req_id_token not in buffer and
+                self._admin_state_machine.state is AdminState.AUTHENTICATED
+        ):
+            return await self._handle_heartbeat(buffer)
+
+        if self._bypass_parsing:
+            raw_message = RawFixMessage(
+                transport_message.buffer,
+                self._engine.fix_message_factory.sep
+            )
+            if raw_message[35] not in self._admin_msgtypes:
+                return await self._handle_raw_application_message(raw_message)
 
         fix_message = self._engine.fix_message_factory.decode(
             transport_message.buffer
         )
-        LOGGER.info('Received %s', fix_message.message)
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info('Received %s', fix_message.message)
 
-        msgcat = cast(str, fix_message.meta_data.msgcat)
-        if msgcat == 'admin':
+        msg_seq_num: int = fix_message.message['MsgSeqNum']
+        await self._save_received(transport_message.buffer, msg_seq_num)
+
+        if self._is_admin[fix_message.message['MsgType']]:
             await self._handle_admin_message(fix_message.message)
         else:
             await self._app.on_application_message(
@@ -82,49 +281,96 @@ class TransportStateMachine(TransportStateProcessor):
                 self._engine
             )
 
-        msg_seq_num: int = cast(int, fix_message.message['MsgSeqNum'])
-        await self._engine.session.set_incoming_seqnum(msg_seq_num)
+        self._last_receive_time = self._time_provider.monotonic()
+
+        return FIX_HANDLED
+
+    async def _handle_heartbeat(
+            self,
+            buffer: bytes
+    ) -> Optional[TransportMessage]:
+        message = _LazyMessage(buffer, self._engine.fix_message_factory)
+        # Logging would decode the message, which this path exists to avoid.
+        if self._log_heartbeats and LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info('Received %s', message)
+
+        raw_message = RawFixMessage(buffer, self._engine.fix_message_factory.sep)
+        await self._save_received(buffer, int(raw_message[34]))
 
-        self._last_receive_time_utc = self._time_provider.now(timezone.utc)
+        if self._has_on_admin_message:
+            await self._app.on_admin_message(message, self._engine)
+        if self._has_on_heartbeat:
+            await self._app.on_heartbeat(message, self._engine)
 
-        return TransportMessage(TransportEvent.FIX_HANDLED)
+        self._last_receive_time = self._time_provider.monotonic()
+
+        return FIX_HANDLED
+
+    async def _handle_raw_application_message(
+            self,
+            raw_message: RawFixMessage
+    ) -> Optional[TransportMessage]:
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info('Received %s', raw_message)
+
+        await self._save_received(raw_message.buffer, int(raw_message[34]))
+
+        await self._app.on_raw_application_message(raw_message, self._engine)
+
+        self._last_receive_time = self._time_provider.monotonic()
+
+        return FIX_HANDLED
 
     async def _handle_admin_message(self, message: Mapping[str, Any]) -> None:
-        assert 'MsgType' in message
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info('admin message: %s', message)
+
+        if self._has_on_admin_message:
+            await self._app.on_admin_message(message, self._engine)
 
-        LOGGER.info('admin message: %s', message)
+        admin_event = self._admin_events.get(message['MsgType'])
+        if admin_event is None:
+            LOGGER.warning(
+                'Ignoring unhandled admin message "%s"',
+                message['MsgType']
+            )
+            return
 
-        await self._app.on_admin_message(message, self._engine)
+        # A heartbeat leaves an authenticated session in the same state, so
+        # it is acknowledged without going through the admin state machine.
+        if (
+                admin_event is AdminEvent.HEARTBEAT_RECEIVED and
+                self._admin_state_machine.state is AdminState.AUTHENTICATED
+        ):
+            if self._has_on_heartbeat:
+                await self._app.on_heartbeat(message, self._engine)
+            return
 
         await self._admin_state_machine.process(
-            AdminMessage(
-                AdminEvent.from_msg_type(message['MsgType']),
-                message
-            )
+            AdminMessage(admin_event, message)
         )
 
     async def _handle_timeout(
             self,
             _transport_message: TransportMessage
     ) -> Optional[TransportMessage]:
-        if self._admin_state_machine.state != AdminState.AUTHENTICATED:
+        if self._admin_state_machine.state is not AdminState.AUTHENTICATED:
             raise RuntimeError('Make a state for this')
 
-        now_utc = self._time_provider.now(timezone.utc)
         seconds_since_last_receive = (
-            now_utc - self._last_receive_time_utc
-        ).total_seconds()
+            self._time_provider.monotonic() - self._last_receive_time
+        )
         elapsed = seconds_since_last_receive - self._engine.heartbeat_timeout
         if elapsed > self._engine.heartbeat_threshold:
-            await self._admin_state_machine.process(
-                AdminMessage(AdminEvent.TEST_HEARTBEAT_REQUIRED)
-            )
+            await self._admin_state_machine.process(_TEST_HEARTBEAT_REQUIRED)
 
-        return TransportMessage(TransportEvent.TIMEOUT_HANDLED)
+        return TIMEOUT_HANDLED
 
     async def _handle_disconnect(
             self,
             _transport_message: TransportMessage
     ) -> Optional[TransportMessage]:
         LOGGER.info('Disconnected')
+        await self.flush()
+        await self._engine.session.flush()
         return None
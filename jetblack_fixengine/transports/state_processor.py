@@ -1,13 +1,18 @@
 """A transport state processor"""
 
 import logging
-from typing import Callable, Awaitable, Optional
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Union
+
+from ..types import InvalidStateTransitionError
 
 from .state_transitions import TransportStateTransitions
 from .types import (
+    TransportEvent,
     TransportState,
     TransportMessage,
-    TransportEventHandlerMapping
+    TransportEventHandler,
+    TransportEventHandlerMapping,
+    TransportDispatchMapping
 )
 
 LOGGER = logging.getLogger(__name__)
@@ -16,12 +21,45 @@ LOGGER = logging.getLogger(__name__)
 class TransportStateProcessor(TransportStateTransitions):
     """A transport state processor with async bindings"""
 
+    __slots__ = ('_dispatch', '_state_dispatch')
+
     def __init__(
             self,
             handlers: TransportEventHandlerMapping
     ) -> None:
         super().__init__()
-        self._handlers = handlers
+        # The handler and next state for each event, by state.
+        self._dispatch: TransportDispatchMapping = {
+            state: {
+                event: (handlers.get(state, {}).get(event), next_state)
+                for event, next_state in event_transitions.items()
+            }
+            for state, event_transitions in self.TRANSITIONS.items()
+        }
+        self._state_dispatch = self._dispatch[self.state]
+
+    def _next(
+            self,
+            event: TransportEvent
+    ) -> Optional[TransportEventHandler]:
+        try:
+            handler, self.state = self._state_dispatch[event]
+        except KeyError as error:
+            raise self._invalid_transition(event) from error
+        self._state_dispatch = self._dispatch[self.state]
+        return handler
+
+    def _invalid_transition(
+            self,
+            event: TransportEvent
+    ) -> InvalidStateTransitionError:
+        return InvalidStateTransitionError(
+            f'unhandled event {self.state.name} -> {event.name}.',
+        )
+
+    def transition(self, event: TransportEvent) -> TransportState:
+        self._next(event)
+        return self.state
 
     async def process(
             self,
@@ -35,15 +73,26 @@ class TransportStateProcessor(TransportStateTransitions):
         Returns:
             TransportState: The new state.
         """
+        # The transition is inlined, as a call to _next per message costs
+        # more than the lookup itself.
+        dispatch = self._dispatch
         while message is not None:
-            handler = self._handlers.get(self.state, {}).get(message.event)
-            self.transition(message.event)
+            try:
+                handler, state = self._state_dispatch[message.event]
+            except KeyError as error:
+                raise self._invalid_transition(message.event) from error
+            self.state = state
+            self._state_dispatch = dispatch[state]
             if handler is None:
                 break
             message = await handler(message)
         return self.state
 
 
-Send = Callable[[TransportMessage], Awaitable[None]]
+# FIX data can be sent as bytes without a TransportMessage.
+Send = Callable[[Union[TransportMessage, bytes]], Awaitable[None]]
 Receive = Callable[[], Awaitable[TransportMessage]]
-TransportHandler = Callable[[Send, Receive], Awaitable[None]]
+# Returns a message that has already been received, or None. A transport
+# can offer one as the nowait attribute of its receive callable.
+ReceiveNowait = Callable[[], Optional[TransportMessage]]
+TransportHandler = Callable[[Send, Receive], Coroutine[Any, Any, None]]
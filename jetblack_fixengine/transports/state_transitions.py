@@ -1,6 +1,7 @@
 """Transport state transitions"""
 
 import logging
+from types import MappingProxyType
 
 from ..types import InvalidStateTransitionError
 
@@ -13,28 +14,39 @@ from .types import (
 LOGGER = logging.getLogger(__name__)
 
 
+_TRANSITIONS: TransportTransitionMapping = {
+    TransportState.DISCONNECTED:  {
+        TransportEvent.CONNECTION_RECEIVED: TransportState.CONNECTED
+    },
+    TransportState.CONNECTED: {
+        TransportEvent.FIX_RECEIVED: TransportState.FIX,
+        TransportEvent.TIMEOUT_RECEIVED: TransportState.TIMEOUT,
+        TransportEvent.DISCONNECT_RECEIVED: TransportState.DISCONNECTED
+    },
+    TransportState.FIX: {
+        TransportEvent.FIX_HANDLED: TransportState.CONNECTED
+    },
+    TransportState.TIMEOUT: {
+        TransportEvent.TIMEOUT_HANDLED: TransportState.CONNECTED
+    },
+}
+
+
 class TransportStateTransitions:
     """A class to manage state transitions for the transport"""
 
-    TRANSITIONS: TransportTransitionMapping = {
-        TransportState.DISCONNECTED:  {
-            TransportEvent.CONNECTION_RECEIVED: TransportState.CONNECTED
-        },
-        TransportState.CONNECTED: {
-            TransportEvent.FIX_RECEIVED: TransportState.FIX,
-            TransportEvent.TIMEOUT_RECEIVED: TransportState.TIMEOUT,
-            TransportEvent.DISCONNECT_RECEIVED: TransportState.DISCONNECTED
-        },
-        TransportState.FIX: {
-            TransportEvent.FIX_HANDLED: TransportState.CONNECTED
-        },
-        TransportState.TIMEOUT: {
-            TransportEvent.TIMEOUT_HANDLED: TransportState.CONNECTED
-        },
-    }
+    __slots__ = ('state', '_state_transitions')
+
+    # The transitions are fixed, so the table is read only.
+    TRANSITIONS: TransportTransitionMapping = MappingProxyType({
+        state: MappingProxyType(transitions)
+        for state, transitions in _TRANSITIONS.items()
+    })
 
     def __init__(self) -> None:
         self.state = TransportState.DISCONNECTED
+        # The transitions from the current state.
+        self._state_transitions = self.TRANSITIONS[self.state]
 
     def transition(self, event: TransportEvent) -> TransportState:
         """Transition from the current state to a new state given an event.
@@ -48,11 +60,13 @@ class TransportStateTransitions:
         Returns:
             TransportState: The new state.
         """
-        LOGGER.debug('Transition from %s with %s', self.state, event)
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug('Transition from %r with %r', self.state, event)
         try:
-            self.state = self.TRANSITIONS[self.state][event]
-            return self.state
+            self.state = self._state_transitions[event]
         except KeyError as error:
             raise InvalidStateTransitionError(
                 f'unhandled event {self.state.name} -> {event.name}.',
             ) from error
+        self._state_transitions = self.TRANSITIONS[self.state]
+        return self.state
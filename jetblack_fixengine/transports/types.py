@@ -1,10 +1,10 @@
 """Transport types"""
 
-from enum import Enum, auto
-from typing import Callable, Awaitable, Mapping, Optional
+from enum import IntEnum, auto
+from typing import Callable, Awaitable, Mapping, Optional, Tuple
 
 
-class TransportState(Enum):
+class TransportState(IntEnum):
     """Transport states"""
     DISCONNECTED = auto()
     CONNECTED = auto()
@@ -12,7 +12,7 @@ class TransportState(Enum):
     TIMEOUT = auto()
 
 
-class TransportEvent(Enum):
+class TransportEvent(IntEnum):
     """Transport events"""
     CONNECTION_RECEIVED = auto()
     FIX_RECEIVED = auto()
@@ -31,6 +31,8 @@ TransportTransitionMapping = Mapping[
 class TransportMessage:
     """A transport message"""
 
+    __slots__ = ('event', 'buffer')
+
     def __init__(
             self,
             event: TransportEvent,
@@ -40,7 +42,7 @@ class TransportMessage:
         self.buffer = buffer if buffer is not None else b''
 
     def __str__(self) -> str:
-        return f'{self.event}: {self.buffer!r}'
+        return f'{self.event.name}: {self.buffer!r}'
 
 
 TransportEventHandler = Callable[
@@ -51,3 +53,10 @@ TransportEventHandlerMapping = Mapping[
     TransportState,
     Mapping[TransportEvent, TransportEventHandler]
 ]
+TransportDispatchMapping = Mapping[
+    TransportState,
+    Mapping[
+        TransportEvent,
+        Tuple[Optional[TransportEventHandler], TransportState]
+    ]
+]
@@ -5,6 +5,8 @@ from typing import Any, Mapping, Optional, Tuple
 
 from jetblack_fixparser.fix_message import FixMessageFactory
 
+from .raw_fix_message import RawFixMessage
+
 
 class Session(metaclass=ABCMeta):
     """A FIX session"""
@@ -52,6 +54,19 @@ class Session(metaclass=ABCMeta):
             seqnum (int): The outgoing seqnum.
         """
 
+    async def increment_outgoing_seqnum(self) -> int:
+        """Increment the outgoing seqnum.
+
+        Stores should override this to perform the increment with a single
+        write.
+
+        Returns:
+            int: The new outgoing seqnum.
+        """
+        seqnum = await self.get_outgoing_seqnum() + 1
+        await self.set_outgoing_seqnum(seqnum)
+        return seqnum
+
     @abstractmethod
     async def get_incoming_seqnum(self) -> int:
         """Get the incoming seqnum.
@@ -76,6 +91,25 @@ class Session(metaclass=ABCMeta):
             buf (bytes): The message.
         """
 
+    async def save_and_advance(self, buf: bytes, incoming_seqnum: int) -> None:
+        """Save a received message and set the incoming seqnum.
+
+        Stores should override this to perform both writes in a single
+        transaction.
+
+        Args:
+            buf (bytes): The message.
+            incoming_seqnum (int): The incoming seqnum.
+        """
+        await self.set_incoming_seqnum(incoming_seqnum)
+        await self.save_message(buf)
+
+    async def flush(self) -> None:
+        """Write any pending changes.
+
+        Stores which defer their writes should override this.
+        """
+
 
 class Store(metaclass=ABCMeta):
     """The abstract class for stores"""
@@ -92,6 +126,12 @@ class Store(metaclass=ABCMeta):
             Session: A session for the sender and target.
         """
 
+    async def aclose(self) -> None:
+        """Release the resources held by the store and its sessions.
+
+        Stores which hold files or connections open should override this.
+        """
+
 
 class InvalidStateTransitionError(Exception):
     """An invalid state transition"""
@@ -101,38 +141,39 @@ class LoginError(Exception):
     """An invalid state transition"""
 
 
-class FIXEngine(metaclass=ABCMeta):
-    """Abstract base class for FIX applications"""
+class FIXEngine:
+    """The interface for FIX engines"""
+
+    __slots__ = ()
 
     @property
-    @abstractmethod
     def session(self) -> Session:
         """The session
 
         Returns:
             Session: The session
         """
+        raise NotImplementedError
 
     @property
-    @abstractmethod
     def fix_message_factory(self) -> FixMessageFactory:
         """THe FIX message factory.
 
         Returns:
             FixMessageFactory: The factory
         """
+        raise NotImplementedError
 
     @property
-    @abstractmethod
     def heartbeat_timeout(self) -> int:
         """The heartbeat timeout"""
+        raise NotImplementedError
 
     @property
-    @abstractmethod
     def heartbeat_threshold(self) -> int:
         """The heartbeat threshold"""
+        raise NotImplementedError
 
-    @abstractmethod
     async def send_message(
             self,
             msg_type: str,
@@ -145,6 +186,7 @@ class FIXEngine(metaclass=ABCMeta):
             message (Optional[Mapping[str, Any]], optional): The message.
                 Defaults to None.
         """
+        raise NotImplementedError
 
 
 class FIXApplication:
@@ -188,6 +230,20 @@ class FIXApplication:
             fix_engine (FIXEngine): The FIX engine.
         """
 
+    async def on_raw_application_message(
+            self,
+            message: RawFixMessage,
+            fix_engine: FIXEngine
+    ) -> None:
+        """Called instead of `on_application_message` when the engine was
+        created with `bypass_parsing` set.
+
+        Args:
+            message (RawFixMessage): The undecoded application message sent by
+                the acceptor.
+            fix_engine (FIXEngine): The FIX engine.
+        """
+
     async def on_logon(
             self,
             message: Mapping[str, Any],
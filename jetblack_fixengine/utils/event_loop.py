@@ -0,0 +1,30 @@
+"""Event loop utilities"""
+
+import asyncio
+import logging
+import sys
+
+LOGGER = logging.getLogger(__name__)
+
+
+def install_uvloop() -> bool:
+    """Use uvloop for new event loops if it is available.
+
+    This should be called before the event loop is started. The uvloop
+    package is not a dependency of this package, and is not available on
+    Windows.
+
+    Returns:
+        bool: True if uvloop was installed.
+    """
+    if sys.platform == 'win32':
+        return False
+
+    try:
+        import uvloop
+    except ImportError:
+        LOGGER.warning('uvloop is not installed')
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
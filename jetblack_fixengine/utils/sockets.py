@@ -0,0 +1,49 @@
+"""Socket utilities"""
+
+from asyncio import StreamWriter
+import logging
+import socket
+from typing import Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+def configure_socket(
+        writer: StreamWriter,
+        *,
+        tcp_nodelay: bool = True,
+        send_buffer_size: Optional[int] = None,
+        receive_buffer_size: Optional[int] = None
+) -> None:
+    """Configure the socket of a connected stream.
+
+    Args:
+        writer (StreamWriter): The stream writer of the connection.
+        tcp_nodelay (bool, optional): If true disable Nagle's algorithm.
+            Defaults to True.
+        send_buffer_size (Optional[int], optional): If set, the size of the
+            socket send buffer. Defaults to None.
+        receive_buffer_size (Optional[int], optional): If set, the size of the
+            socket receive buffer. Defaults to None.
+    """
+    sock: Optional[socket.socket] = writer.get_extra_info('socket')
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+
+    try:
+        if tcp_nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if send_buffer_size is not None:
+            sock.setsockopt(
+                socket.SOL_SOCKET,
+                socket.SO_SNDBUF,
+                send_buffer_size
+            )
+        if receive_buffer_size is not None:
+            sock.setsockopt(
+                socket.SOL_SOCKET,
+                socket.SO_RCVBUF,
+                receive_buffer_size
+            )
+    except OSError:
+        LOGGER.warning('Failed to configure the socket', exc_info=True)
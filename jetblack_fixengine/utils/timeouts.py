@@ -0,0 +1,45 @@
+"""Utilities for timeouts"""
+
+import asyncio
+import sys
+from typing import Awaitable, TypeVar
+
+T = TypeVar('T')
+
+if sys.version_info >= (3, 11):
+
+    async def wait_with_timeout(awaitable: Awaitable[T], timeout: float) -> T:
+        """Wait for an awaitable with a timeout.
+
+        The awaitable runs in the current task, so no task is created for
+        each call.
+
+        Args:
+            awaitable (Awaitable[T]): The awaitable.
+            timeout (float): The timeout in seconds.
+
+        Raises:
+            asyncio.TimeoutError: If the timeout expired.
+
+        Returns:
+            T: The result of the awaitable.
+        """
+        async with asyncio.timeout(timeout):
+            return await awaitable
+
+else:
+
+    async def wait_with_timeout(awaitable: Awaitable[T], timeout: float) -> T:
+        """Wait for an awaitable with a timeout.
+
+        Args:
+            awaitable (Awaitable[T]): The awaitable.
+            timeout (float): The timeout in seconds.
+
+        Raises:
+            asyncio.TimeoutError: If the timeout expired.
+
+        Returns:
+            T: The result of the awaitable.
+        """
+        return await asyncio.wait_for(awaitable, timeout)
@@ -0,0 +1,77 @@
+"""Tests for the initiator engine"""
+
+import asyncio
+from datetime import datetime, timezone
+import logging
+
+import pytest
+
+from jetblack_fixparser.loader import load_yaml_protocol
+from jetblack_fixparser.fix_message import FixMessageFactory
+from jetblack_fixparser.fix_message.errors import DecodingError
+
+from jetblack_fixengine.initiator.initiator import InitiatorEngine
+from jetblack_fixengine.transports.types import TransportMessage
+
+from ..mocks import MockStore
+from .mocks import MockInitiatorApp
+
+
+@pytest.mark.asyncio
+async def test_wait_stopped_logs_error(caplog: pytest.LogCaptureFixture) -> None:
+    """Test waiting for an engine that failed logs the error"""
+    engine = InitiatorEngine(
+        MockInitiatorApp(),
+        load_yaml_protocol('etc/FIX44.yaml'),
+        'INITIATOR',
+        'ACCEPTOR',
+        MockStore(),
+        30,
+        30,
+        asyncio.Event()
+    )
+
+    async def send(_message: object) -> None:
+        pass
+
+    async def receive() -> TransportMessage:
+        raise RuntimeError('connection failed')
+
+    engine_task = asyncio.create_task(engine(send, receive))
+    await asyncio.sleep(0)
+
+    with caplog.at_level(logging.ERROR):
+        await engine.wait_stopped()
+    assert 'The initiator stopped with an error' in caplog.text
+    with pytest.raises(RuntimeError):
+        await engine_task
+
+
+@pytest.mark.parametrize('validate', [True, False])
+def test_validate(validate: bool) -> None:
+    """Test the engine only checks received messages when asked to"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    engine = InitiatorEngine(
+        MockInitiatorApp(),
+        protocol,
+        'INITIATOR',
+        'ACCEPTOR',
+        MockStore(),
+        30,
+        30,
+        asyncio.Event(),
+        validate=validate
+    )
+    buf = FixMessageFactory(protocol, 'ACCEPTOR', 'INITIATOR').create(
+        'HEARTBEAT',
+        1,
+        datetime(2000, 1, 1, tzinfo=timezone.utc)
+    ).encode(regenerate_integrity=True)
+    # Corrupt the checksum.
+    buf = buf[:-4] + b'000\x01'
+
+    if validate:
+        with pytest.raises(DecodingError):
+            engine.fix_message_factory.decode(buf)
+    else:
+        assert engine.fix_message_factory.decode(buf).message['MsgSeqNum'] == 1
@@ -106,6 +106,52 @@ async def test_logon() -> None:
     assert state == AdminState.DISCONNECTED
 
 
+@pytest.mark.asyncio
+async def test_reject_missing_fields() -> None:
+    """Test admin messages without a required field are rejected"""
+    session = MockSession('INITIATOR', 'ACCEPTOR', 0, 0)
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    fix_message_factory = FixMessageFactory(protocol, 'INITIATOR', 'ACCEPTOR')
+    messages: List[Tuple[str, Optional[Mapping[str, Any]]]] = []
+
+    async def send_message(
+            msg_type: str,
+            message: Optional[Mapping[str, Any]]
+    ) -> None:
+        messages.append((msg_type, message))
+        # The message must be encodable.
+        fix_message_factory.create(
+            msg_type,
+            len(messages),
+            datetime(2000, 1, 1, tzinfo=timezone.utc),
+            message
+        ).encode(regenerate_integrity=True)
+
+    state_machine = InitiatorAdminStateMachine(
+        MockInitiator(session, fix_message_factory, 30, 1, send_message),
+        MockInitiatorApp()
+    )
+    await state_machine.process(AdminMessage(AdminEvent.CONNECTED))
+    await state_machine.process(
+        AdminMessage(AdminEvent.LOGON_RECEIVED, {'MsgType': 'LOGON'})
+    )
+    assert state_machine.state == AdminState.AUTHENTICATED
+
+    for event, msg_type, field in (
+            (AdminEvent.TEST_REQUEST_RECEIVED, 'TEST_REQUEST', 'TestReqID'),
+            (AdminEvent.SEQUENCE_RESET_RECEIVED, 'SEQUENCE_RESET', 'NewSeqNo'),
+    ):
+        state = await state_machine.process(
+            AdminMessage(event, {'MsgType': msg_type, 'MsgSeqNum': 7})
+        )
+        assert state == AdminState.AUTHENTICATED
+        assert messages[-1] == (
+            'REJECT',
+            {'RefSeqNum': 7, 'Text': f'Required tag missing: {field}'}
+        )
+    assert await session.get_incoming_seqnum() == 0
+
+
 def test_initiator_admin_state():
     """Test initiator state"""
     state_machine = AdminStateTransition(INITIATOR_ADMIN_TRANSITIONS)
@@ -0,0 +1,208 @@
+"""Tests for the transport state machine of an initiator"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, List, Mapping, Optional
+
+import pytest
+
+from jetblack_fixparser.loader import load_yaml_protocol
+from jetblack_fixparser.fix_message import FixMessageFactory
+
+from jetblack_fixengine.admin import AdminState
+from jetblack_fixengine.initiator.state_machine import InitiatorAdminStateMachine
+from jetblack_fixengine.raw_fix_message import RawFixMessage
+from jetblack_fixengine.transports.state_machine import TransportStateMachine
+from jetblack_fixengine.transports.types import TransportEvent, TransportMessage
+from jetblack_fixengine.types import FIXApplication, FIXEngine
+
+from ..mocks import MockSession, MockTimeProvider
+from .mocks import MockInitiator, MockInitiatorApp
+
+
+class RecordingSession(MockSession):
+    """A session which records the messages it saves"""
+
+    def __init__(self, failures: int = 0) -> None:
+        super().__init__('INITIATOR', 'ACCEPTOR', 0, 0)
+        self.failures = failures
+        self.saved: List[bytes] = []
+
+    async def save_message(self, buf: bytes) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise OSError('save failed')
+        self.saved.append(buf)
+
+
+class Connection:
+    """An initiator's transport state machine, fed encoded messages"""
+
+    def __init__(
+            self,
+            session: MockSession,
+            app: FIXApplication,
+            **kwargs: Any
+    ) -> None:
+        protocol = load_yaml_protocol('etc/FIX44.yaml')
+        self.time_provider = MockTimeProvider(
+            datetime(2000, 1, 1, tzinfo=timezone.utc)
+        )
+        self._factory = FixMessageFactory(protocol, 'ACCEPTOR', 'INITIATOR')
+
+        async def send_message(
+                _msg_type: str,
+                _message: Optional[Mapping[str, Any]]
+        ) -> None:
+            await session.increment_outgoing_seqnum()
+
+        initiator = MockInitiator(
+            session,
+            FixMessageFactory(protocol, 'INITIATOR', 'ACCEPTOR'),
+            30,
+            1,
+            send_message
+        )
+        self.admin_state_machine = InitiatorAdminStateMachine(initiator, app)
+        self.transport_state_machine = TransportStateMachine(
+            initiator,
+            app,
+            self.admin_state_machine,
+            self.time_provider,
+            **kwargs
+        )
+
+    def encode(
+            self,
+            msg_type: str,
+            msg_seq_num: int,
+            message: Optional[Mapping[str, Any]] = None
+    ) -> bytes:
+        """Encode a message sent by the acceptor"""
+        return self._factory.create(
+            msg_type,
+            msg_seq_num,
+            self.time_provider.now(timezone.utc),
+            message
+        ).encode(regenerate_integrity=True)
+
+    async def receive(
+            self,
+            msg_type: str,
+            msg_seq_num: int,
+            message: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        """Receive a message sent by the acceptor"""
+        await self.transport_state_machine.process(
+            TransportMessage(
+                TransportEvent.FIX_RECEIVED,
+                self.encode(msg_type, msg_seq_num, message)
+            )
+        )
+
+    async def logon(self) -> None:
+        """Connect and receive the acceptor's logon"""
+        await self.transport_state_machine.process(
+            TransportMessage(TransportEvent.CONNECTION_RECEIVED)
+        )
+        await self.receive('LOGON', 1, {'EncryptMethod': 'NONE', 'HeartBtInt': 30})
+        assert self.admin_state_machine.state == AdminState.AUTHENTICATED
+
+
+@pytest.mark.asyncio
+async def test_sequence_reset_with_save_interval() -> None:
+    """Test a SequenceReset is not undone by the queued saves"""
+    session = MockSession('INITIATOR', 'ACCEPTOR', 0, 0)
+    connection = Connection(session, MockInitiatorApp(), save_interval=60)
+    await connection.logon()
+
+    await connection.receive(
+        'SEQUENCE_RESET',
+        2,
+        {'GapFillFlag': False, 'NewSeqNo': 10}
+    )
+    assert connection.admin_state_machine.state == AdminState.AUTHENTICATED
+    await connection.transport_state_machine.flush()
+    assert await session.get_incoming_seqnum() == 10
+
+
+@pytest.mark.asyncio
+async def test_save_interval_error() -> None:
+    """Test a failed background save is reported and the message kept"""
+    session = RecordingSession(failures=1)
+    connection = Connection(session, MockInitiatorApp(), save_interval=0.01)
+    await connection.logon()
+    await asyncio.sleep(0.05)
+    assert not session.saved
+
+    with pytest.raises(OSError):
+        await connection.transport_state_machine.flush()
+    assert session.saved == [connection.encode(
+        'LOGON',
+        1,
+        {'EncryptMethod': 'NONE', 'HeartBtInt': 30}
+    )]
+    # The error is only reported once.
+    await connection.transport_state_machine.flush()
+
+
+class RawApp(MockInitiatorApp):
+    """An application which records the messages it receives"""
+
+    def __init__(self) -> None:
+        self.admin_messages: List[Mapping[str, Any]] = []
+        self.application_messages: List[Mapping[str, Any]] = []
+        self.raw_messages: List[RawFixMessage] = []
+
+    async def on_admin_message(
+            self,
+            message: Mapping[str, Any],
+            fix_engine: FIXEngine
+    ) -> None:
+        self.admin_messages.append(message)
+
+    async def on_application_message(
+            self,
+            message: Mapping[str, Any],
+            fix_engine: FIXEngine
+    ) -> None:
+        self.application_messages.append(message)
+
+    async def on_raw_application_message(
+            self,
+            message: RawFixMessage,
+            fix_engine: FIXEngine
+    ) -> None:
+        self.raw_messages.append(message)
+
+
+@pytest.mark.asyncio
+async def test_bypass_parsing() -> None:
+    """Test only admin messages are decoded when bypassing parsing"""
+    session = RecordingSession()
+    app = RawApp()
+    connection = Connection(session, app, bypass_parsing=True)
+    await connection.logon()
+    assert [message['MsgType'] for message in app.admin_messages] == ['LOGON']
+    assert await session.get_incoming_seqnum() == 1
+
+    news = {'Headline': 'Hello', 'NoLinesOfText': [{'Text': 'World'}]}
+    await connection.receive('NEWS', 2, news)
+    assert not app.application_messages
+    assert len(app.raw_messages) == 1
+    assert app.raw_messages[0].buffer == connection.encode('NEWS', 2, news)
+    assert app.raw_messages[0][148] == b'Hello'
+    assert await session.get_incoming_seqnum() == 2
+
+    await connection.receive('TEST_REQUEST', 3, {'TestReqID': 'test'})
+    assert app.admin_messages[-1]['MsgType'] == 'TEST_REQUEST'
+    assert app.admin_messages[-1]['TestReqID'] == 'test'
+    assert connection.admin_state_machine.state == AdminState.AUTHENTICATED
+    assert len(app.raw_messages) == 1
+    assert await session.get_incoming_seqnum() == 3
+
+    assert session.saved == [
+        connection.encode('LOGON', 1, {'EncryptMethod': 'NONE', 'HeartBtInt': 30}),
+        connection.encode('NEWS', 2, news),
+        connection.encode('TEST_REQUEST', 3, {'TestReqID': 'test'}),
+    ]
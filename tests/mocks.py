@@ -44,6 +44,10 @@ class MockSession(Session):
     async def set_outgoing_seqnum(self, seqnum: int) -> None:
         self._outgoing_seqnum = seqnum
 
+    async def increment_outgoing_seqnum(self) -> int:
+        self._outgoing_seqnum += 1
+        return self._outgoing_seqnum
+
     async def get_incoming_seqnum(self) -> int:
         return self._incoming_seqnum
 
@@ -0,0 +1,43 @@
+"""Tests for FixMessageTemplate"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from jetblack_fixparser import load_yaml_protocol
+from jetblack_fixparser.fix_message import FixMessageFactory
+
+from jetblack_fixengine.fix_message_template import FixMessageTemplate
+
+
+@pytest.mark.parametrize('filename,is_millisecond_time', [
+    ('etc/FIX42.yaml', False),
+    ('etc/FIX42.yaml', True),
+    ('etc/FIX44.yaml', True),
+])
+def test_matches_factory(filename: str, is_millisecond_time: bool):
+    """Test the template encodes the same bytes as the factory"""
+    protocol = load_yaml_protocol(
+        filename,
+        is_millisecond_time=is_millisecond_time
+    )
+    factory = FixMessageFactory(protocol, 'SENDER', 'TARGET')
+
+    for msg_type, message in (
+            ('HEARTBEAT', None),
+            ('TEST_REQUEST', {'TestReqID': 'test'}),
+    ):
+        template = FixMessageTemplate(factory, msg_type, message)
+        for msg_seq_num, sending_time in (
+                (1, datetime(2020, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)),
+                (2, datetime(2020, 1, 2, 3, 4, 5, 999000, tzinfo=timezone.utc)),
+                (3, datetime(2020, 1, 3, 3, 4, 5, 1000, tzinfo=timezone.utc)),
+                (12345, datetime(2021, 12, 31, 23, 59, 59, tzinfo=timezone.utc)),
+        ):
+            expected = factory.create(
+                msg_type,
+                msg_seq_num,
+                sending_time,
+                message
+            ).encode(regenerate_integrity=True)
+            assert template.encode(msg_seq_num, sending_time) == expected
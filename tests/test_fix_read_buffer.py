@@ -1,12 +1,16 @@
 """ Tests for FixReadBuffer"""
 
+import asyncio
 from typing import Iterator, cast
 
+import pytest
+
 from jetblack_fixengine.transports.fix_events import (
     FixReadError, FixReadEventType,
     FixReadDataReady
 )
 from jetblack_fixengine.transports.fix_read_buffer import FixReadBuffer
+from jetblack_fixengine.transports.fix_reader_async import fix_read_async
 
 
 def _bytes_writer(buf: bytes, chunk_size: int = -1) -> Iterator[bytes]:
@@ -95,3 +99,51 @@ def test_read_corrupt_buffer():
         assert False
     else:
         assert False
+
+
+def test_read_chunk_sizes():
+    """Test messages are read whether split or sharing a chunk"""
+    messages = [
+        b'8=FIX.4.4|9=94|35=3|49=A|56=AB|128=B1|34=214|50=U1|52=20100304-09:42:23.130|45=176|371=15|372=X|373=1|58=txt|10=058|',
+        b'8=FIX.4.4|9=117|35=AD|49=A|56=B|34=2|50=1|57=M|52=20100219-14:33:32.258|568=1|569=0|263=1|580=1|75=20100218|60=20100218-00:00:00.000|10=202|',
+    ] * 3
+    input_buf = b''.join(messages)
+
+    for chunk_size in (1, 7, len(input_buf)):
+        reader = FixReadBuffer(
+            sep=b'|',
+            convert_sep_to_soh_for_checksum=True,
+            validate=True
+        )
+        writer = _bytes_writer(input_buf, chunk_size)
+        received = []
+        while True:
+            fix_event = reader.next_event()
+            if fix_event.event_type == FixReadEventType.EOF:
+                break
+            elif fix_event.event_type == FixReadEventType.NEEDS_MORE_DATA:
+                reader.receive(next(writer, b''))
+            elif fix_event.event_type == FixReadEventType.DATA_READY:
+                received.append(cast(FixReadDataReady, fix_event).data)
+        assert received == messages
+
+
+@pytest.mark.asyncio
+async def test_read_async_with_length_hint():
+    """Test the async reader reads the rest of a message in one go"""
+    message = b'8=FIX.4.4|9=5|35=0|10=163|'
+    stream_reader = asyncio.StreamReader()
+    stream_reader.feed_data(message * 2 + message[:20])
+    stream_reader.feed_eof()
+
+    read_buffer = FixReadBuffer(
+        sep=b'|',
+        convert_sep_to_soh_for_checksum=True,
+        validate=True
+    )
+    messages = []
+    with pytest.raises(FixReadError):
+        # The truncated message is an error, once the complete ones are read.
+        async for buf in fix_read_async(read_buffer, stream_reader, 20):
+            messages.append(buf)
+    assert messages == [message, message]
@@ -0,0 +1,185 @@
+"""Tests for persistence"""
+
+from pathlib import Path
+import sqlite3
+
+import pytest
+
+from jetblack_fixengine import FileStore, SqlStore
+from jetblack_fixengine.persistence.file_store import FileSession
+
+
+@pytest.mark.asyncio
+async def test_file_store_seqnums(tmp_path: Path) -> None:
+    """Test the file store persists seqnums"""
+    store = FileStore(tmp_path)
+    session = store.get_session('INITIATOR', 'ACCEPTOR')
+    assert await session.get_seqnums() == (0, 0)
+
+    assert await session.increment_outgoing_seqnum() == 1
+    assert await session.increment_outgoing_seqnum() == 2
+    await session.set_incoming_seqnum(5)
+
+    reloaded = FileStore(tmp_path).get_session('INITIATOR', 'ACCEPTOR')
+    assert await reloaded.get_seqnums() == (2, 5)
+
+
+@pytest.mark.asyncio
+async def test_sql_store_seqnums(tmp_path: Path) -> None:
+    """Test the sql store persists seqnums"""
+    database = str(tmp_path / 'store.db')
+    store = SqlStore([database], {})
+    session = store.get_session('INITIATOR', 'ACCEPTOR')
+    assert await session.get_seqnums() == (0, 0)
+
+    assert await session.increment_outgoing_seqnum() == 1
+    assert await session.increment_outgoing_seqnum() == 2
+    await session.set_incoming_seqnum(5)
+
+    reloaded = SqlStore([database], {}).get_session('INITIATOR', 'ACCEPTOR')
+    assert await reloaded.get_seqnums() == (2, 5)
+
+
+@pytest.mark.asyncio
+async def test_sql_store_sessions(tmp_path: Path) -> None:
+    """Test sql store sessions keep separate seqnums"""
+    database = str(tmp_path / 'store.db')
+    store = SqlStore([database], {})
+    first = store.get_session('INITIATOR', 'ACCEPTOR')
+    second = store.get_session('INITIATOR', 'OTHER')
+    await first.set_seqnums(3, 4)
+    await second.set_seqnums(5, 6)
+
+    reloaded = SqlStore([database], {})
+    assert await reloaded.get_session('INITIATOR', 'ACCEPTOR').get_seqnums() == (3, 4)
+    assert await reloaded.get_session('INITIATOR', 'OTHER').get_seqnums() == (5, 6)
+
+
+@pytest.mark.asyncio
+async def test_sql_store_save_and_advance(tmp_path: Path) -> None:
+    """Test the sql store saves the message and incoming seqnum together"""
+    database = str(tmp_path / 'store.db')
+    store = SqlStore([database], {})
+    session = store.get_session('INITIATOR', 'ACCEPTOR')
+
+    await session.save_and_advance(b'8=FIX.4.4\x019=5\x0135=0\x0110=000\x01', 7)
+    assert await session.get_incoming_seqnum() == 7
+
+    reloaded = SqlStore([database], {}).get_session('INITIATOR', 'ACCEPTOR')
+    assert await reloaded.get_seqnums() == (0, 7)
+
+
+@pytest.mark.asyncio
+async def test_sql_store_defer_outgoing_seqnum(tmp_path: Path) -> None:
+    """Test deferred outgoing seqnum writes are persisted on flush"""
+    database = str(tmp_path / 'store.db')
+    store = SqlStore([database], {}, defer_outgoing_seqnum=True)
+    session = store.get_session('INITIATOR', 'ACCEPTOR')
+    assert await session.increment_outgoing_seqnum() == 1
+    assert await session.increment_outgoing_seqnum() == 2
+    await session.flush()
+
+    reloaded = SqlStore([database], {}).get_session('INITIATOR', 'ACCEPTOR')
+    assert await reloaded.get_seqnums() == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_sql_store_defer_outgoing_seqnum_error(tmp_path: Path) -> None:
+    """Test a failed deferred outgoing seqnum write is raised by flush"""
+    database = str(tmp_path / 'store.db')
+    store = SqlStore([database], {}, defer_outgoing_seqnum=True)
+    session = store.get_session('INITIATOR', 'ACCEPTOR')
+    with sqlite3.connect(database) as conn:
+        conn.execute('DROP TABLE initiator_seqnums')
+
+    await session.increment_outgoing_seqnum()
+    await session.increment_outgoing_seqnum()
+    with pytest.raises(sqlite3.OperationalError):
+        await session.flush()
+    # The error is only reported once.
+    await session.flush()
+    await store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_file_store_seqnums_shrink(tmp_path: Path) -> None:
+    """Test a shorter seqnum line replaces a longer one"""
+    session = FileStore(tmp_path).get_session('INITIATOR', 'ACCEPTOR')
+    await session.set_seqnums(100, 100)
+    await session.set_seqnums(9, 9)
+    assert isinstance(session, FileSession)
+    await session.aclose()
+
+    reloaded = FileStore(tmp_path).get_session('INITIATOR', 'ACCEPTOR')
+    assert await reloaded.get_seqnums() == (9, 9)
+    path = tmp_path / 'INITIATOR-ACCEPTOR-initiator-seqnum.txt'
+    assert path.read_text(encoding='utf8') == '9:9\n'
+
+
+@pytest.mark.asyncio
+async def test_file_store_save_interval(tmp_path: Path) -> None:
+    """Test seqnum updates are written together after the interval"""
+    path = tmp_path / 'INITIATOR-ACCEPTOR-initiator-seqnum.txt'
+    session = FileStore(
+        tmp_path,
+        save_interval=60
+    ).get_session('INITIATOR', 'ACCEPTOR')
+    await session.increment_outgoing_seqnum()
+    await session.set_incoming_seqnum(3)
+    assert path.read_text(encoding='utf8') == '0:0\n'
+
+    await session.flush()
+    assert path.read_text(encoding='utf8') == '1:3\n'
+
+
+@pytest.mark.asyncio
+async def test_file_store_save_message(tmp_path: Path) -> None:
+    """Test the file store writes messages in the chosen style"""
+    buf = b'8=FIX.4.4\x019=5\x0135=0\x0110=000\x01'
+    for message_style, expected in (
+            ('text', '8=FIX.4.4|9=5|35=0|10=000|\n'),
+            ('urlencode', '8%3DFIX.4.4%019%3D5%0135%3D0%0110%3D000%01\n'),
+            ('hex', buf.hex()),
+    ):
+        folder = tmp_path / message_style
+        session = FileStore(
+            folder,
+            message_style=message_style  # type: ignore
+        ).get_session('INITIATOR', 'ACCEPTOR')
+        await session.save_message(buf)
+        path = folder / 'INITIATOR-ACCEPTOR-initiator-message.txt'
+        assert path.read_text(encoding='ascii') == expected
+
+    with pytest.raises(ValueError):
+        FileStore(
+            tmp_path,
+            message_style='binary'  # type: ignore
+        ).get_session('INITIATOR', 'ACCEPTOR')
+
+
+@pytest.mark.asyncio
+async def test_file_store_sync_every(tmp_path: Path) -> None:
+    """Test the file store still persists seqnums when syncing"""
+    session = FileStore(
+        tmp_path,
+        sync_every=2
+    ).get_session('INITIATOR', 'ACCEPTOR')
+    for _ in range(3):
+        await session.increment_outgoing_seqnum()
+    assert isinstance(session, FileSession)
+    await session.aclose()
+
+    reloaded = FileStore(tmp_path).get_session('INITIATOR', 'ACCEPTOR')
+    assert await reloaded.get_seqnums() == (3, 0)
+
+
+@pytest.mark.asyncio
+async def test_file_store_aclose(tmp_path: Path) -> None:
+    """Test closing the file store writes and closes its sessions"""
+    store = FileStore(tmp_path, save_interval=60)
+    session = store.get_session('INITIATOR', 'ACCEPTOR')
+    await session.increment_outgoing_seqnum()
+    await store.aclose()
+
+    reloaded = FileStore(tmp_path).get_session('INITIATOR', 'ACCEPTOR')
+    assert await reloaded.get_seqnums() == (1, 0)
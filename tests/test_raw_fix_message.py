@@ -0,0 +1,18 @@
+"""Tests for RawFixMessage"""
+
+from jetblack_fixengine import RawFixMessage
+
+
+def test_get_fields():
+    """Test fields are found on demand"""
+    message = RawFixMessage(
+        b'8=FIX.4.4|9=50|35=D|49=A|56=B|34=12|52=20100225-19:41:57.316|10=000|',
+        b'|'
+    )
+    assert message[8] == b'FIX.4.4'
+    assert message[35] == b'D'
+    assert message[34] == b'12'
+    assert message[10] == b'000'
+    assert message.get(58) is None
+    assert 49 in message
+    assert 58 not in message
@@ -0,0 +1,19 @@
+"""Tests for timeouts"""
+
+import asyncio
+
+import pytest
+
+from jetblack_fixengine.utils.timeouts import wait_with_timeout
+
+
+@pytest.mark.asyncio
+async def test_wait_with_timeout() -> None:
+    """Test waiting with a timeout"""
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await wait_with_timeout(queue.get(), 0.01)
+
+    await queue.put(1)
+    assert await wait_with_timeout(queue.get(), 0.01) == 1